@@ -1,11 +1,17 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+datas = [('config/config.json', 'config'), ('assets/augment_reference.png', 'assets')]
+# Tuned detector parameters, only present after running tools/tune_detectors.py
+if os.path.exists('config/detector_profile.json'):
+    datas.append(('config/detector_profile.json', 'config'))
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('config/config.json', 'config')],
+    datas=datas,
     hiddenimports=['core.run_arena', 'core.run_aram', 'core.run_test', 'core.run_yuumi_sr'],
     hookspath=[],
     hooksconfig={},
@@ -1,8 +1,14 @@
 @echo off
 REM Build INTAI.exe
 
+REM Tuned detector parameters, only present after running tools/tune_detectors.py
+set PROFILE_DATA=
+if exist config\detector_profile.json set PROFILE_DATA=--add-data "config/detector_profile.json;config"
+
 pyinstaller --noconfirm --uac-admin --icon=assets/app_icon.ico --name INTAI main.py ^
   --add-data "config/config.json;config" ^
+  --add-data "assets/augment_reference.png;assets" ^
+  %PROFILE_DATA% ^
   --hidden-import=core.run_arena ^
   --hidden-import=core.run_aram ^
   --hidden-import=core.run_test ^
@@ -2,8 +2,12 @@
 # Project-wide constants
 # ==========================================================
 
-import win32api
 import os
+try:
+    import win32api
+except ImportError:
+    # Non-Windows machines (e.g. running tools/benchmarks on Linux) fall back to a 1080p screen
+    win32api = None
 
 
 # ===========================
@@ -53,6 +57,153 @@ ARENA_EXIT_UPPER_COLOR = (81,119,137) # gold HEX: #897751
 ARENA_EXIT_LOWER_COLOR = (41,32,24) # dark blue HEX: #182029
 ATTACHED_ALLY_LEFT_COLOR = (222,97,99) # light purple HEX: #6361DE
 ATTACHED_ALLY_RIGHT_COLOR = (140,55,55) # dark purple HEX: #37378C
+MINIMAP_ALLY_COLOR = (214, 124, 29) # blue HEX: #1D7CD6
+MINIMAP_ENEMY_COLOR = (39, 39, 210) # red HEX: #D22727
+
+
+# ===========================
+# CV Detector Definitions
+# ===========================
+
+# Adjacent color detectors. Each entry describes one color pair search:
+#   bgr_1 / bgr_2: colors on the left/top and right/bottom side of the pair
+#   bgr_1_tolerance / bgr_2_tolerance: per-channel color tolerance
+#   run_length: minimum adjacent pixels along the opposite axis of shift_axis
+#   shift_axis: 'x' for horizontally adjacent pairs, 'y' for vertically adjacent pairs
+#   offset: (x, y) added to every hit, e.g. to move from a health bar to the champion
+#   region: (x0, y0, x1, y1) HUD region the element always appears in, in reference
+#           (UI_REFERENCE_RESOLUTION) pixels. Scaled to the configured game resolution at runtime.
+# Detectors sharing bgr_1, bgr_1_tolerance and shift_axis reuse the same border mask
+# when they are run together.
+CHAMPION_DETECTORS = {
+    "ally": {
+        "bgr_1": HEALTH_LEFT_COLOR, "bgr_2": ALLY_HEALTH_RIGHT_COLOR,
+        "bgr_1_tolerance": 3, "bgr_2_tolerance": 3,
+        "run_length": 4, "shift_axis": "x", "offset": (50, 160),
+    },
+    "enemy": {
+        "bgr_1": HEALTH_LEFT_COLOR, "bgr_2": ENEMY_HEALTH_RIGHT_COLOR,
+        "bgr_1_tolerance": 3, "bgr_2_tolerance": 3,
+        "run_length": 4, "shift_axis": "x", "offset": (50, 160),
+    },
+    "player": {
+        "bgr_1": HEALTH_LEFT_COLOR, "bgr_2": PLAYER_HEALTH_RIGHT_COLOR,
+        "bgr_1_tolerance": 3, "bgr_2_tolerance": 3,
+        "run_length": 4, "shift_axis": "x", "offset": (50, 160),
+    },
+    "attached_ally": {
+        "bgr_1": ATTACHED_ALLY_LEFT_COLOR, "bgr_2": ATTACHED_ALLY_RIGHT_COLOR,
+        "bgr_1_tolerance": 3, "bgr_2_tolerance": 3,
+        "run_length": 4, "shift_axis": "x", "offset": (50, 160),
+    },
+}
+
+# Hits closer than this many pixels are grouped into the same health bar
+HEALTH_BAR_CLUSTER_GAP = 8
+
+# Health bar geometry at 1080p, see assets/health_references.png. The colored rows end in a
+# one-pixel border of HEALTH_BAR_END_COLOR after HEALTH_BAR_WIDTH pixels.
+HEALTH_BAR_WIDTH = 105
+HEALTH_BAR_END_COLOR = (5, 5, 5)
+
+# Health fill is colored, the drained part of a bar is gray: pixels whose largest and smallest
+# channel differ by at least this much count as filled
+HEALTH_BAR_FILL_CHROMA = 40
+
+# First-hit search: rows (columns for vertically adjacent pairs) per band, scanned in order until a hit is found
+FIRST_HIT_BAND_SIZE = 64
+
+# Champion tracker: pixels searched around a track's predicted health bar between full scans
+TRACKER_SEARCH_MARGIN = 48
+
+# Champion tracker: seconds between full-frame scans that pick up newly visible champions
+TRACKER_FULL_SCAN_INTERVAL = 0.25
+
+# Champion tracker: largest pixel distance between a prediction and a detection of the same champion
+TRACKER_MATCH_DISTANCE = 120
+
+# Champion tracker: consecutive missed updates before a track is dropped
+TRACKER_MAX_MISSES = 3
+
+# Captured frames kept by ScreenManager, see FrameRing
+FRAME_BUFFER_SLOTS = 4
+
+# Resolution the UI detector regions are defined at
+UI_REFERENCE_RESOLUTION = (1920, 1080)
+
+# Consecutive region-of-interest misses before a UI detector switches to full-screen scans, see find_ui_locations
+UI_ROI_MISS_STREAK = 30
+
+# Rows per band of a region fingerprint. Each band stores one checksum per pixel column and channel,
+# so changed pixels are only missed if they cancel out within the same band and column.
+REGION_FINGERPRINT_BAND_HEIGHT = 32
+
+UI_DETECTORS = {
+    "augment": {
+        "bgr_1": AUGMENT_UPPER_COLOR, "bgr_2": AUGMENT_LOWER_COLOR,
+        "bgr_1_tolerance": 3, "bgr_2_tolerance": 3,
+        "run_length": 1, "shift_axis": "y", "offset": (0, -400),
+        "region": (560, 640, 1360, 1040),
+    },
+    "shop": {
+        "bgr_1": SHOP_UPPER_COLOR, "bgr_2": SHOP_LOWER_COLOR,
+        "bgr_1_tolerance": 2, "bgr_2_tolerance": 5,
+        "run_length": 1, "shift_axis": "y", "offset": (0, 0),
+        "region": (240, 640, 1680, 1080),
+    },
+    "arena_exit": {
+        "bgr_1": ARENA_EXIT_UPPER_COLOR, "bgr_2": ARENA_EXIT_LOWER_COLOR,
+        "bgr_1_tolerance": 1, "bgr_2_tolerance": 0,
+        "run_length": 1, "shift_axis": "y", "offset": (0, 0),
+        "region": (560, 640, 1360, 1080),
+    },
+}
+
+# Minimap region at the default minimap scale, in reference (UI_REFERENCE_RESOLUTION) pixels
+MINIMAP_REGION = (1640, 800, 1920, 1080)
+
+# Minimap champion markers. Each marker is a champion icon inside a colored ring:
+#   bgr / tolerance: ring color and per-channel tolerance
+#   min_area / max_area: ring pixel count of one marker at the reference resolution. Larger blobs
+#       are overlapping markers and still reported once, smaller ones are pings and minions.
+MINIMAP_MARKERS = {
+    "ally": {"bgr": MINIMAP_ALLY_COLOR, "tolerance": 40, "min_area": 40, "max_area": 1200},
+    "enemy": {"bgr": MINIMAP_ENEMY_COLOR, "tolerance": 40, "min_area": 40, "max_area": 1200},
+}
+
+# Scene classifier: (width, height) of the frame thumbnail it looks at
+SCENE_THUMBNAIL_SIZE = (64, 36)
+
+# Scene classifier states of the UI detectors. A state is present if at least `min_cells` thumbnail
+# pixels inside the detector's region are within `tolerance` (per channel) of one of `colors`.
+# Thumbnail pixels cover about 30x30 screen pixels, so only large UI panels are visible in it.
+# Thresholds lean towards false positives, which only cost one localizer run. They are untuned
+# starting values: small elements like the 60 px shop button pair can be missed, see General.scene_classifier.
+SCENE_STATES = {
+    # (104, 86, 8): median color of the panel in assets/augment_reference.png
+    "augment": {"colors": [(104, 86, 8), AUGMENT_UPPER_COLOR], "tolerance": 24, "min_cells": 2},
+    "shop": {"colors": [SHOP_UPPER_COLOR], "tolerance": 16, "min_cells": 8},
+    "arena_exit": {"colors": [ARENA_EXIT_UPPER_COLOR], "tolerance": 20, "min_cells": 2},
+}
+
+# Scene classifier: the screen turns gray while the player is dead. The frame counts as gray
+# when the mean difference between the largest and smallest channel of the thumbnail is below this.
+SCENE_DEAD_MAX_CHROMA = 24
+
+# Reference templates for UI detectors, captured at UI_REFERENCE_RESOLUTION.
+#   path: image in assets/
+#   threshold: minimum normalized correlation (TM_CCOEFF_NORMED) of a match
+# A template match reports the template's first color-pair hit plus the detector offset,
+# so both detection methods point at the same spot.
+UI_TEMPLATES = {
+    "augment": {"path": "augment_reference.png", "threshold": 0.85},
+}
+
+# Template matching first searches the region downscaled by this factor
+UI_TEMPLATE_PYRAMID_SCALE = 0.25
+
+# A downscaled match this far below the threshold ends the search without a full-resolution pass
+UI_TEMPLATE_COARSE_MARGIN = 0.15
 
 
 # ===========================
@@ -99,8 +250,12 @@ DATA_DRAGON_DEFAULT_LOCALE = "en_US"
 THRESHHOLD = 70
 
 # Get screen dimensions using win32api
-SCREEN_WIDTH = win32api.GetSystemMetrics(0)
-SCREEN_HEIGHT = win32api.GetSystemMetrics(1)
+if win32api is not None:
+    SCREEN_WIDTH = win32api.GetSystemMetrics(0)
+    SCREEN_HEIGHT = win32api.GetSystemMetrics(1)
+else:
+    SCREEN_WIDTH = 1920
+    SCREEN_HEIGHT = 1080
 SCREEN_CENTER = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
 
 # Parameters for the hybrid pixel->game units predictor (kept as constants for stability)
@@ -0,0 +1,523 @@
+import glob
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+import cv2
+import numpy as np
+from utils.config_utils import load_settings
+
+
+class FrameSource:
+    """
+    Interface of the capture backends behind ScreenManager, modeled on the dxcam camera:
+    `start`, `stop`, `get_latest_frame`, `grab` and `is_capturing`.
+    Frames are BGR arrays, and every new frame is a new array, so consumers can tell frames apart by identity.
+    """
+
+    @property
+    def is_capturing(self):
+        """Whether the capture thread is running."""
+        raise NotImplementedError
+
+
+    def start(self, target_fps=60, region=None, on_frame=None):
+        """
+        Starts capturing frames in the background.
+        Args:
+            target_fps (int): Frames per second to capture.
+            region (tuple, optional): (x0, y0, x1, y1) screen region to capture. Captures the whole screen by default.
+            on_frame (callable, optional): called with every new frame on the capture thread, e.g. `FrameRing.put`.
+        """
+        raise NotImplementedError
+
+
+    def stop(self):
+        """
+        Stops capturing frames.
+        """
+        raise NotImplementedError
+
+
+    def get_latest_frame(self):
+        """
+        Returns the latest captured frame, or None before the first one.
+        """
+        raise NotImplementedError
+
+
+    def grab(self, region=None):
+        """
+        Captures and returns one frame without the capture thread.
+        Args:
+            region (tuple, optional): (x0, y0, x1, y1) screen region to capture.
+        """
+        raise NotImplementedError
+
+
+class DxcamFrameSource(FrameSource):
+    """
+    DXGI desktop capture using `dxcam`. Windows only, dxcam is imported on creation.
+    """
+
+    def __init__(self, output_color="BGR"):
+        import dxcam
+        self._camera = dxcam.create(output_color=output_color)
+        self._stop_event = threading.Event()
+        self._thread = None
+
+
+    @property
+    def is_capturing(self):
+        return self._camera.is_capturing
+
+
+    def start(self, target_fps=60, region=None, on_frame=None):
+        # dxcam copies only the region out of the desktop texture
+        self._camera.start(target_fps=target_fps, region=region)
+        if on_frame is None:
+            return
+        self._stop_event.clear()
+
+        def _forward():
+            # get_latest_frame blocks until dxcam has a frame newer than the previous call's
+            while not self._stop_event.is_set() and self._camera.is_capturing:
+                frame = self._camera.get_latest_frame()
+                if frame is not None and not self._stop_event.is_set():
+                    on_frame(frame)
+
+        self._thread = threading.Thread(target=_forward, name="frame_source", daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        self._stop_event.set()
+        self._camera.stop()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+    def get_latest_frame(self):
+        return self._camera.get_latest_frame()
+
+
+    def grab(self, region=None):
+        return self._camera.grab(region=region)
+
+
+class _PlaybackFrameSource(FrameSource):
+    """
+    Plays an indexed sequence of frames on a capture thread, at `speed` times the capture rate.
+    Subclasses provide `__len__` and `_load(index)`.
+    """
+
+    def __init__(self, speed=1.0, loop=True):
+        """
+        Args:
+            speed (float): playback speed relative to `target_fps`, 0 plays frames as fast as they load.
+            loop (bool): start over after the last frame instead of stopping.
+        """
+        self.speed = speed
+        self.loop = loop
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._frame = None
+        self._index = 0
+        self._region = None
+        self.frames_played = 0
+
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+    def _load(self, index):
+        """
+        Returns frame `index` as a new BGR array.
+        """
+        raise NotImplementedError
+
+
+    @property
+    def is_capturing(self):
+        return self._thread is not None and self._thread.is_alive()
+
+
+    def _next(self, region=None):
+        """
+        Loads the frame at the playback position and advances it.
+        Args:
+            region (tuple, optional): (x0, y0, x1, y1) part of the frame to return.
+        Returns:
+            tuple: (whether the end was reached, the frame or None if it could not be loaded)
+        """
+        with self._lock:
+            if self._index >= len(self):
+                if not self.loop or len(self) == 0:
+                    return True, None
+                self._index = 0
+            index = self._index
+            self._index += 1
+        frame = self._load(index)
+        if frame is not None and region is not None:
+            x0, y0, x1, y1 = region
+            frame = np.ascontiguousarray(frame[y0:y1, x0:x1])
+        return False, frame
+
+
+    def start(self, target_fps=60, region=None, on_frame=None):
+        if self.is_capturing:
+            logging.error("Frame source is already capturing.")
+            raise RuntimeError("Frame source is already capturing.")
+        interval = 1.0 / (target_fps * self.speed) if target_fps and self.speed else 0.0
+        self._region = region
+        self._stop_event.clear()
+
+        def _loop():
+            next_time = time.monotonic()
+            while not self._stop_event.is_set():
+                ended, frame = self._next(self._region)
+                if ended:
+                    logging.info("Frame source reached the end of its %d frames.", len(self))
+                    break
+                if frame is not None:
+                    self._frame = frame
+                    self.frames_played += 1
+                    if on_frame is not None:
+                        on_frame(frame)
+                if interval:
+                    next_time += interval
+                    delay = next_time - time.monotonic()
+                    if delay > 0:
+                        self._stop_event.wait(delay)
+                    else:
+                        # Behind schedule, e.g. slow PNG decoding: keep the rate instead of catching up in a burst
+                        next_time = time.monotonic()
+
+        self._thread = threading.Thread(target=_loop, name="frame_source", daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+    def get_latest_frame(self):
+        return self._frame
+
+
+    def grab(self, region=None):
+        """
+        Returns the frame at the playback position and advances it by one,
+        so tools can step through the frames in order without the capture thread.
+        """
+        _, frame = self._next(region)
+        if frame is not None:
+            self._frame = frame
+        return frame
+
+
+    def seek(self, index=0):
+        """
+        Moves the playback position to frame `index`.
+        """
+        with self._lock:
+            self._index = max(0, min(int(index), len(self)))
+
+
+class ReplayFrameSource(_PlaybackFrameSource):
+    """
+    Replays a recorded session: a directory of *.png frames sorted by name, or a .npy stack of
+    shape (N, H, W, 3) read through a memory map, so long recordings are not loaded at once.
+    """
+
+    def __init__(self, path, speed=1.0, loop=True):
+        """
+        Args:
+            path (str): directory of *.png frames or path of a .npy stack.
+            speed (float): playback speed relative to `target_fps`, 0 plays frames as fast as they load.
+            loop (bool): start over after the last frame instead of stopping.
+        """
+        super().__init__(speed, loop)
+        self.path = path
+        self._files = None
+        self._stack = None
+        if os.path.isdir(path):
+            self._files = sorted(glob.glob(os.path.join(path, "*.png")))
+        elif path.endswith(".npy"):
+            self._stack = np.load(path, mmap_mode="r")
+            if self._stack.ndim != 4 or self._stack.shape[3] != 3:
+                raise ValueError(f"Expected a (N, H, W, 3) stack, got {self._stack.shape}")
+        else:
+            raise ValueError(f"Unsupported recording: {path}")
+        if len(self) == 0:
+            logging.warning("Recording %s has no frames.", path)
+
+
+    def __len__(self):
+        if self._stack is not None:
+            return self._stack.shape[0]
+        return len(self._files)
+
+
+    def _load(self, index):
+        if self._stack is not None:
+            return np.ascontiguousarray(self._stack[index])
+        frame = cv2.imread(self._files[index])
+        if frame is None:
+            logging.error("Failed to read frame %s", self._files[index])
+        return frame
+
+
+class SyntheticFrameSource(_PlaybackFrameSource):
+    """
+    Plays synthetic scenes from `utils/synthetic_utils.py`, for running the game loops and the
+    vision thread without a game. Scenes are generated once, from seeds 0 .. frames - 1,
+    so every run sees the same frames.
+    """
+
+    def __init__(self, width=1920, height=1080, bars=8, frames=8, ui=(), minimap=None, speed=1.0, loop=True):
+        """
+        Args:
+            width (int): frame width in pixels.
+            height (int): frame height in pixels.
+            bars (int): health bars per scene.
+            frames (int): distinct scenes to cycle through.
+            ui (iterable): UI_DETECTORS names to paint, see generate_scene.
+            minimap (dict, optional): MINIMAP_MARKERS name -> number of markers, see generate_scene.
+            speed (float): playback speed relative to `target_fps`, 0 plays frames as fast as they are copied.
+            loop (bool): start over after the last scene instead of stopping.
+        """
+        from utils.synthetic_utils import generate_scene
+        super().__init__(speed, loop)
+        self._scenes = [
+            generate_scene(width, height, bars, ui=tuple(ui), seed=seed, minimap=minimap)[0]
+            for seed in range(max(1, frames))
+        ]
+
+
+    def __len__(self):
+        return len(self._scenes)
+
+
+    def _load(self, index):
+        # A copy, so consecutive frames are distinct arrays even with a single scene
+        return self._scenes[index].copy()
+
+
+CapturedFrame = namedtuple("CapturedFrame", ["sequence", "timestamp", "frame"])
+CapturedFrame.__doc__ = """
+One frame of a FrameRing.
+Fields:
+    sequence (int): increases by one for every captured frame, starting at 1
+    timestamp (float): `time.monotonic()` time the frame was captured
+    frame (np.ndarray): BGR frame
+"""
+
+
+class FrameRing:
+    """
+    Ring buffer of the latest captured frames, each with a sequence number and capture timestamp.
+    Frames are copied out of the capture backend's own buffers, so a frame never changes after it
+    was published while a reader holds a lease on it, see `release`. Unleased frames stay valid
+    until their slot is written again, `slots` frames later.
+    Consumers wait for the next sequence number instead of polling for a changed frame.
+    """
+
+    def __init__(self, slots=4, scale=1.0):
+        """
+        Args:
+            slots (int): frames kept for readers that fall behind.
+            scale (float): resize factor applied while copying a frame in, see `General.capture`.
+        """
+        self.slots = max(1, int(slots))
+        self.scale = scale
+        self._condition = threading.Condition()
+        self._entries = [None] * self.slots
+        self._buffers = [None] * self.slots
+        # id(buffer) -> readers holding a lease on it; a leased buffer is never written again
+        self._leases = {}
+        self._sequence = 0
+        self.reused = 0
+        self.allocated = 0
+
+
+    @property
+    def sequence(self):
+        """Sequence number of the latest frame, 0 before the first one."""
+        return self._sequence
+
+
+    def _lease(self, entry, lease):
+        """
+        Adds a lease on `entry` if requested. Must be called with the condition held.
+        """
+        if lease and entry is not None:
+            key = id(entry.frame)
+            self._leases[key] = self._leases.get(key, 0) + 1
+        return entry
+
+
+    def release(self, captured):
+        """
+        Releases a lease taken with `lease=True`, allowing the frame's buffer to be written again.
+        Args:
+            captured (CapturedFrame | None): the leased frame. None is ignored.
+        """
+        if captured is None:
+            return
+        key = id(captured.frame)
+        with self._condition:
+            count = self._leases.get(key, 0)
+            if count <= 0:
+                logging.warning("Released frame %d without a lease.", captured.sequence)
+            elif count == 1:
+                del self._leases[key]
+            else:
+                self._leases[key] = count - 1
+
+
+    def put(self, frame, timestamp=None):
+        """
+        Copies a captured frame into the next slot and wakes up waiting readers.
+        Called by one capture thread at a time. The slot buffer is reused unless a reader holds
+        a lease on it, in which case a new buffer replaces it.
+        Args:
+            frame (np.ndarray): BGR frame, may be a view the backend overwrites later.
+            timestamp (float, optional): `time.monotonic()` capture time. Defaults to now.
+        Returns:
+            int: sequence number of the frame.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        H, W = frame.shape[:2]
+        if self.scale != 1:
+            H, W = int(round(H * self.scale)), int(round(W * self.scale))
+        shape = (H, W) + frame.shape[2:]
+        index = (self._sequence + 1) % self.slots
+        with self._condition:
+            # Unpublish the slot before writing, so no new reader can lease the buffer meanwhile
+            self._entries[index] = None
+            buffer = self._buffers[index]
+            reuse = buffer is not None and buffer.shape == shape and id(buffer) not in self._leases
+        if reuse:
+            self.reused += 1
+        else:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[index] = buffer
+            self.allocated += 1
+        if self.scale != 1:
+            cv2.resize(frame, (W, H), dst=buffer, interpolation=cv2.INTER_AREA)
+        else:
+            np.copyto(buffer, frame)
+
+        with self._condition:
+            self._sequence += 1
+            self._entries[index] = CapturedFrame(self._sequence, timestamp, buffer)
+            self._condition.notify_all()
+            return self._sequence
+
+
+    def latest(self, lease=False):
+        """
+        Returns the latest CapturedFrame, or None before the first frame.
+        Args:
+            lease (bool): hold the frame until `release` is called with it.
+        """
+        with self._condition:
+            entry = self._entries[self._sequence % self.slots] if self._sequence else None
+            return self._lease(entry, lease)
+
+
+    def get(self, sequence, lease=False):
+        """
+        Returns the CapturedFrame with a sequence number, or None if it was not captured yet or was overwritten.
+        Args:
+            sequence (int): sequence number of the frame.
+            lease (bool): hold the frame until `release` is called with it.
+        """
+        with self._condition:
+            entry = self._entries[sequence % self.slots]
+            entry = entry if entry is not None and entry.sequence == sequence else None
+            return self._lease(entry, lease)
+
+
+    def wait_for_frame(self, after_seq=0, timeout=1.0, latest=True, lease=False):
+        """
+        Waits for a frame newer than `after_seq`.
+        Args:
+            after_seq (int): sequence number of the last frame the caller processed, 0 for any frame.
+            timeout (float): seconds to wait.
+            latest (bool): return the newest frame, skipping any the caller missed. Otherwise returns
+                the frame right after `after_seq`, or the oldest kept one if it was already overwritten.
+            lease (bool): hold the frame until `release` is called with it.
+        Returns:
+            CapturedFrame | None: the frame, or None on timeout.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._sequence <= after_seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            entry = self._entries[self._sequence % self.slots]
+            if not latest:
+                oldest = max(after_seq + 1, self._sequence - self.slots + 1)
+                for sequence in range(oldest, self._sequence + 1):
+                    candidate = self._entries[sequence % self.slots]
+                    if candidate is not None and candidate.sequence == sequence:
+                        entry = candidate
+                        break
+            return self._lease(entry, lease)
+
+
+_frame_sources = {}
+
+
+def register_frame_source(name, factory):
+    """
+    Registers a frame source backend.
+    Args:
+        name (str): backend name, selected with `General.frame_source.backend`.
+        factory (callable): takes the `General.frame_source` options as keyword arguments and returns a FrameSource.
+    """
+    _frame_sources[name] = factory
+
+
+def get_frame_sources():
+    """
+    Returns the registered frame source backends, name -> factory.
+    """
+    return dict(_frame_sources)
+
+
+def create_frame_source(settings=None):
+    """
+    Creates the configured frame source.
+    Args:
+        settings (dict, optional): backend name and options, e.g. {"backend": "replay", "path": "data/session_01"}.
+            Defaults to `General.frame_source`, and to dxcam capture if that is not set.
+    Returns:
+        FrameSource: the created backend.
+    """
+    if settings is None:
+        _, general = load_settings()
+        settings = general.get("frame_source", {})
+    options = dict(settings)
+    backend = options.pop("backend", "dxcam")
+    if backend not in _frame_sources:
+        raise ValueError(f"Unknown frame source: {backend}, choose from {', '.join(_frame_sources)}")
+    logging.info("Using the %s frame source.", backend)
+    return _frame_sources[backend](**options)
+
+
+register_frame_source("dxcam", DxcamFrameSource)
+register_frame_source("replay", ReplayFrameSource)
+register_frame_source("synthetic", SyntheticFrameSource)
@@ -0,0 +1,256 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+from core.constants import CHAMPION_DETECTORS, MINIMAP_MARKERS, UI_DETECTORS
+from utils.cv_utils import SINGLE_RESULT_DETECTORS, ChampionTracker, DetectorContext, FramePerception, RegionChangeTracker
+
+
+class DetectionSnapshot(namedtuple("DetectionSnapshot", ["sequence", "timestamp", "detections", "tracked", "latency", "scene", "markers"])):
+    """
+    Immutable detection results of one analyzed frame, published by the PerceptionManager.
+    Offers the same lookups as FramePerception, so game loops can use either.
+    Fields:
+        sequence (int): increases by one for every published snapshot
+        timestamp (float): `time.monotonic()` time the frame was taken from the camera
+        detections (Mapping): name -> tuple of (x, y) locations, only the first for SINGLE_RESULT_DETECTORS
+            and the locations of the tracks for names the ChampionTracker follows
+        tracked (Mapping): name -> tuple of read-only tracks, see ChampionTracker.get_tracks
+        latency (float): seconds from capturing the frame to publishing its snapshot
+        scene (Mapping): UI state of the frame, see classify_scene
+        markers (Mapping): name -> tuple of minimap marker locations, see find_minimap_markers
+    """
+    __slots__ = ()
+
+    def locations(self, name):
+        """
+        Returns the locations of a named detector, see FramePerception.locations.
+        """
+        return list(self.detections.get(name, ()))
+
+
+    def first_location(self, name):
+        """
+        Returns the first location for a named detector, or [] if nothing was found.
+        """
+        locations = self.detections.get(name, ())
+        if not locations:
+            return []
+        return locations[0]
+
+
+    def tracks(self, name):
+        """
+        Returns the tracked champions of a named detector, see FramePerception.tracks.
+        """
+        return list(self.tracked.get(name, ()))
+
+
+    def minimap(self, name):
+        """
+        Returns the minimap marker locations of a MINIMAP_MARKERS name, see FramePerception.minimap.
+        """
+        return list(self.markers.get(name, ()))
+
+
+    @property
+    def age(self):
+        """Seconds since the analyzed frame was captured."""
+        return time.monotonic() - self.timestamp
+
+    @property
+    def allies(self):
+        """Ally locations, see `find_ally_locations`."""
+        return self.locations("ally")
+
+    @property
+    def enemies(self):
+        """Enemy locations, see `find_enemy_locations`."""
+        return self.locations("enemy")
+
+    @property
+    def player(self):
+        """Player location, see `find_player_location`."""
+        return self.first_location("player")
+
+    @property
+    def attached_ally(self):
+        """Attached ally location, see `find_attached_ally_location`."""
+        return self.first_location("attached_ally")
+
+    @property
+    def augment(self):
+        """Augment location, see `find_augment_location`."""
+        return self.first_location("augment")
+
+    @property
+    def shop(self):
+        """Shop location, see `find_shop_location`."""
+        return self.first_location("shop")
+
+    @property
+    def arena_exit(self):
+        """Arena exit location, see `find_arena_exit_location`."""
+        return self.first_location("arena_exit")
+
+
+class PerceptionManager:
+    """
+    Runs the detectors on a dedicated vision thread and publishes a DetectionSnapshot for every new frame.
+    Game loops read the latest snapshot without waiting for detection, so their latency only depends on
+    input and decision time, and they see frames that were analyzed while they were busy sending keys.
+    Owns its own detector buffers, tracker and region fingerprints, none of which are shared with
+    ScreenManager's on-demand perception.
+    """
+
+    def __init__(self, stop_event, screen_manager, names=None):
+        """
+        Initialize the PerceptionManager.
+
+        Args:
+            stop_event (threading.Event): Event the caller sets to request its managed thread to stop
+            screen_manager (ScreenManager): capture source of the analyzed frames.
+            names (iterable, optional): CHAMPION_DETECTORS and UI_DETECTORS names to run. Runs all by default.
+        """
+        self.stop_event = stop_event
+        self.internal_stop_event = threading.Event()
+        self.screen_manager = screen_manager
+        self.names = tuple(names) if names is not None else tuple(CHAMPION_DETECTORS) + tuple(UI_DETECTORS)
+        self._condition = threading.Condition()
+        self._snapshot = None
+        self._manager_thread = None
+        self._context = DetectorContext()
+        self._tracker = ChampionTracker()
+        self._changes = RegionChangeTracker()
+
+
+    def start_vision_thread(self, poll_time=0.1):
+        """
+        Continuously analyzes new frames and publishes their snapshots.
+        Waits for each new frame by its sequence number and skips frames captured while the
+        previous one was analyzed. Exits when stop_event is set.
+        Args:
+            poll_time (float): Seconds to wait for a new frame before checking the stop events again.
+        """
+        self.internal_stop_event.clear()
+        if self._manager_thread and self._manager_thread.is_alive():
+            logging.error("Vision thread is already running.")
+            raise RuntimeError("Vision thread is already running.")
+        def _loop():
+            sequence = 0
+            frame_sequence = 0
+            while not self.stop_event.is_set() and not self.internal_stop_event.is_set():
+                captured = self.screen_manager.wait_for_frame(frame_sequence, timeout=poll_time, lease=True)
+                if captured is None:
+                    continue
+                frame_sequence = captured.sequence
+
+                try:
+                    snapshot = self.analyze(captured.frame, sequence + 1, captured.timestamp)
+                except Exception:
+                    logging.exception("Vision thread failed to analyze a frame")
+                    time.sleep(poll_time)
+                    continue
+                finally:
+                    self.screen_manager.release_frame(captured)
+
+                sequence += 1
+                with self._condition:
+                    self._snapshot = snapshot
+                    self._condition.notify_all()
+
+        self._manager_thread = threading.Thread(target=_loop, name="vision", daemon=True)
+        self._manager_thread.start()
+
+
+    def stop_vision_thread(self, timeout=5):
+        """
+        Stops the vision thread.
+        """
+        self.internal_stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._manager_thread:
+            self._manager_thread.join(timeout=timeout)
+            if self._manager_thread.is_alive():
+                logging.error("Vision thread failed to exit within the given timeout.")
+                raise RuntimeError("Vision thread failed to exit within the given timeout.")
+            self._manager_thread = None
+            logging.info("Vision thread has exited.")
+        else:
+            logging.info("Vision thread is not running, nothing to stop.")
+
+
+    def is_running(self):
+        """
+        Returns whether the vision thread is running.
+        """
+        return self._manager_thread is not None and self._manager_thread.is_alive()
+
+
+    def analyze(self, frame, sequence=0, timestamp=None):
+        """
+        Runs every configured detector on one frame.
+        Args:
+            frame (np.ndarray): BGR frame.
+            sequence (int): sequence number of the snapshot.
+            timestamp (float, optional): `time.monotonic()` time the frame was captured. Defaults to now.
+        Returns:
+            DetectionSnapshot: results of the frame.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        perception = FramePerception(frame, self._context, self._tracker, timestamp, self._changes)
+        tracks = {
+            name: tuple(MappingProxyType(track) for track in perception.tracks(name))
+            for name in self._tracker.names
+        }
+        detections = {}
+        for name in self.names:
+            if name in tracks:
+                # Between full scans the tracker only searches windows, so tracked names skip the full scan
+                detections[name] = tuple(track["location"] for track in tracks[name])
+            elif name in SINGLE_RESULT_DETECTORS:
+                location = perception.first_location(name)
+                detections[name] = (location,) if location else ()
+            else:
+                detections[name] = tuple(perception.locations(name))
+        return DetectionSnapshot(
+            sequence,
+            timestamp,
+            MappingProxyType(detections),
+            MappingProxyType(tracks),
+            time.monotonic() - timestamp,
+            MappingProxyType(dict(perception.scene)),
+            MappingProxyType({name: tuple(perception.minimap(name)) for name in MINIMAP_MARKERS}),
+        )
+
+
+    def get_snapshot(self):
+        """
+        Returns the latest snapshot without blocking, or None if no frame was analyzed yet.
+        """
+        return self._snapshot
+
+
+    def wait_for_snapshot(self, newer_than=None, timeout=1.0):
+        """
+        Waits for a snapshot of a frame captured after `newer_than`, e.g. to see the result of an action.
+        Args:
+            newer_than (float, optional): `time.monotonic()` time the frame must be newer than. Defaults to now.
+            timeout (float): Seconds to wait before returning the latest snapshot anyway.
+        Returns:
+            DetectionSnapshot | None: the first matching snapshot, or the latest one on timeout.
+        """
+        if newer_than is None:
+            newer_than = time.monotonic()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._snapshot is None or self._snapshot.timestamp <= newer_than:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.is_running():
+                    logging.debug("No snapshot newer than %.3f after %.2fs, using the latest one.", newer_than, timeout)
+                    break
+                self._condition.wait(remaining)
+            return self._snapshot
@@ -24,11 +24,12 @@ from utils.game_utils import (
     is_game_started,
     move_random_offset,
     pan_to_ally,
+    pan_to_minimap,
+    pick_minimap_ally,
     level_up_abilities,
     tether_offset,
     vote_surrender,
 )
-from utils.cv_utils import find_ally_locations, find_augment_location, find_enemy_locations, find_player_location
 
 # ===========================
 # Main Bot Loop
@@ -62,6 +63,7 @@ def run_game_loop(stop_event):
     attack_range = latest_game_data["activePlayer"]["championStats"]["attackRange"]
     ally_priority_list = [1,2,3,4] # Adaptive order to follow most active allies
     prev_level = 0
+    target_id = None # Track ID of the last attacked enemy
     start_time = time.time()
     last_afk_check_time = time.time()
     time.sleep(5)
@@ -91,13 +93,17 @@ def run_game_loop(stop_event):
             ally_priority_list.append(ally_priority_list.pop(0))
             last_afk_check_time = time.time()
 
+        # Detections of the latest frame, computed once and reused this tick
+        perception = screen_manager.get_perception()
+
         # Check for augment
-        augment = find_augment_location(screen_manager.get_latest_frame())
+        augment = perception.augment
         if augment:
             click_percent(augment[0], augment[1])
             time.sleep(0.5)
             buy_recommended_items(screen_manager)
             time.sleep(0.5)
+            perception = screen_manager.get_perception(fresh=True)
 
         # Level up
         if current_level > prev_level:
@@ -108,7 +114,7 @@ def run_game_loop(stop_event):
         if current_hp == 0:
             end_time = 20 + time.monotonic()
             while not game_ended and not stop_event.is_set():
-                augment = find_augment_location(screen_manager.get_latest_frame())
+                augment = screen_manager.get_perception().augment
                 if augment:
                     click_percent(augment[0], augment[1])
                 if buy_recommended_items(screen_manager) == True:
@@ -120,8 +126,8 @@ def run_game_loop(stop_event):
             continue
 
         # Combat phase
-        ally_locations = find_ally_locations(screen_manager.get_latest_frame())
-        enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
+        ally_locations = perception.allies
+        enemy_locations = perception.enemies
 
         if ally_locations and enemy_locations: #TT
             last_afk_check_time = time.time()
@@ -130,11 +136,14 @@ def run_game_loop(stop_event):
             time.sleep(0.2)
             # fight enemy
             send_keybind("evtCameraSnap", _keybinds, press_time=0.2)
-            enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
-            player_location = find_player_location(screen_manager.get_latest_frame())
+            perception = screen_manager.get_perception(fresh=True)
+            enemy_tracks = perception.tracks("enemy")
+            player_location = perception.player
             if player_location:
-                for enemy_location in enemy_locations:
-                    if attack_enemy(player_location, enemy_location, attack_range) == True:
+                # Stay on the previous target while it is still tracked, then prefer the lowest health
+                for enemy_track in sorted(enemy_tracks, key=lambda track: (track["id"] != target_id, track.get("fill", 1.0))):
+                    if attack_enemy(player_location, enemy_track["location"], attack_range) == True:
+                        target_id = enemy_track["id"]
                         break
             
 
@@ -148,8 +157,9 @@ def run_game_loop(stop_event):
         elif not ally_locations and enemy_locations: #FT
             # kite away from enemy, and fight if too close
             send_keybind("evtCameraSnap", _keybinds, press_time=0.2)
-            enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
-            player_location = find_player_location(screen_manager.get_latest_frame())
+            perception = screen_manager.get_perception(fresh=True)
+            enemy_locations = perception.enemies
+            player_location = perception.player
             if player_location:
                 for enemy_location in enemy_locations:
                     tether_offset(player_location, enemy_location, 1000)
@@ -157,20 +167,28 @@ def run_game_loop(stop_event):
             
 
         else: #FF
-            # look for current ally (highest-priority is at front)
-            pan_to_ally(ally_priority_list[0], press_time=0.2)
-            move_mouse_percent(SCREEN_CENTER[0], SCREEN_CENTER[1])
-            # not found, try other allies — move found ally to front for faster future hits
-            if not find_ally_locations(screen_manager.get_latest_frame()):
-                n = len(ally_priority_list)
-                # probe remaining allies in order after the front
-                for offset in range(1, n):
-                    i = offset
-                    ally = ally_priority_list[i]
-                    pan_to_ally(ally, press_time=0.3)
-                    if find_ally_locations(screen_manager.get_latest_frame()):
-                        ally_priority_list.insert(0, ally_priority_list.pop(i))
-                        break
+            # pan straight to an ally seen on the minimap, closest to the fight
+            minimap_allies = perception.minimap("ally")
+            found = False
+            if minimap_allies:
+                pan_to_minimap(pick_minimap_ally(minimap_allies, perception.minimap("enemy")))
+                move_mouse_percent(SCREEN_CENTER[0], SCREEN_CENTER[1])
+                found = bool(screen_manager.get_perception(fresh=True).allies)
+            if not found:
+                # look for current ally (highest-priority is at front)
+                pan_to_ally(ally_priority_list[0], press_time=0.2)
+                move_mouse_percent(SCREEN_CENTER[0], SCREEN_CENTER[1])
+                # not found, try other allies — move found ally to front for faster future hits
+                if not screen_manager.get_perception(fresh=True).allies:
+                    n = len(ally_priority_list)
+                    # probe remaining allies in order after the front
+                    for offset in range(1, n):
+                        i = offset
+                        ally = ally_priority_list[i]
+                        pan_to_ally(ally, press_time=0.3)
+                        if screen_manager.get_perception(fresh=True).allies:
+                            ally_priority_list.insert(0, ally_priority_list.pop(i))
+                            break
         
         time.sleep(0.01) 
         
\ No newline at end of file
@@ -14,7 +14,6 @@ from core.constants import SCREEN_CENTER
 from core.live_client_manager import LiveClientManager
 from core.screen_manager import ScreenManager
 from utils.config_utils import load_settings
-from utils.cv_utils import find_arena_exit_location, find_augment_location, find_enemy_locations, find_player_location
 from utils.game_utils import (
     attack_enemy,
     buy_items_list,
@@ -61,6 +60,7 @@ def run_game_loop(stop_event):
     attack_range = latest_game_data["activePlayer"]["championStats"]["attackRange"]
     target_ally_number = 1
     prev_level = 0
+    target_id = None # Track ID of the last attacked enemy
     prev_gold = 0
     start_time = time.time()
     time.sleep(5)
@@ -73,8 +73,11 @@ def run_game_loop(stop_event):
             gold = latest_game_data["activePlayer"]["currentGold"]
             game_ended = is_game_ended(latest_game_data)
 
+        # Detections of the latest frame, computed once and reused this tick
+        perception = screen_manager.get_perception()
+
         # Exits loop on game_ended or shutdown
-        exit_button = find_arena_exit_location(screen_manager.get_latest_frame())
+        exit_button = perception.arena_exit
         if exit_button:
             click_percent(exit_button[0], exit_button[1])
             game_ended = True
@@ -96,7 +99,7 @@ def run_game_loop(stop_event):
             time.sleep(5)
             end_time = 20 + time.monotonic()
             while not game_ended and not stop_event.is_set():
-                augment = find_augment_location(screen_manager.get_latest_frame())
+                augment = screen_manager.get_perception().augment
                 if augment:
                     click_percent(augment[0], augment[1])
                 if buy_recommended_items(screen_manager) == True:
@@ -108,22 +111,26 @@ def run_game_loop(stop_event):
                 level_up_abilities()
                 prev_level = current_level
             time.sleep(2)
-            augment = find_augment_location(screen_manager.get_latest_frame())
+            augment = screen_manager.get_perception().augment
             if augment:
                 click_percent(augment[0], augment[1])
             prev_gold = gold
             vote_surrender()
+            perception = screen_manager.get_perception(fresh=True)
         
             
         # Combat phase
-        enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
+        enemy_locations = perception.enemies
         if enemy_locations:
             send_keybind("evtCameraSnap", _keybinds, press_time=0.2)
-            enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
-            player_location = find_player_location(screen_manager.get_latest_frame())
+            perception = screen_manager.get_perception(fresh=True)
+            enemy_tracks = perception.tracks("enemy")
+            player_location = perception.player
             if player_location:
-                for enemy_location in enemy_locations: 
-                    if attack_enemy(player_location, enemy_location, attack_range) == True:
+                # Stay on the previous target while it is still tracked, then prefer the lowest health
+                for enemy_track in sorted(enemy_tracks, key=lambda track: (track["id"] != target_id, track.get("fill", 1.0))):
+                    if attack_enemy(player_location, enemy_track["location"], attack_range) == True:
+                        target_id = enemy_track["id"]
                         break
         else:
             # Move to ally
@@ -15,7 +15,6 @@ from core.constants import SCREEN_CENTER, AFK_TIMEOUT
 from core.live_client_manager import LiveClientManager
 from core.screen_manager import ScreenManager
 from utils.config_utils import load_settings
-from utils.cv_utils import find_ally_locations, find_attached_ally_location, find_attached_ally_location, find_enemy_locations
 from utils.game_utils import (
     buy_recommended_items,
     get_game_distance,
@@ -25,6 +24,8 @@ from utils.game_utils import (
     level_up_ability,
     move_random_offset,
     pan_to_ally,
+    pan_to_minimap,
+    pick_minimap_ally,
     retreat,
     vote_surrender,
 )
@@ -129,13 +130,14 @@ def run_game_loop(stop_event):
                     break
                 # Check if attached successfully
                 pan_to_ally(ally_priority_list[ally_index], 1)
-                attached_ally_location = find_attached_ally_location(screen_manager.get_latest_frame())
+                perception = screen_manager.get_perception(fresh=True)
+                attached_ally_location = perception.attached_ally
                 if attached_ally_location:
                     logging.info("Successfully attached.")
                     attached = True
                     break
                 # Attempt to attach
-                if find_ally_locations(screen_manager.get_latest_frame()):
+                if perception.allies:
                     click_percent(SCREEN_CENTER[0], SCREEN_CENTER[1], button="right")
                     send_keybind("evtCastSpell2", _keybinds)
                     time.sleep(3) # Wait for attach animation
@@ -145,6 +147,20 @@ def run_game_loop(stop_event):
                     ally_index += 1
                     # No allies found, just recall
                     if ally_index == len(ally_priority_list):
+                        # Last try before recalling: an ally seen on the minimap. Only a confirmed attach counts,
+                        # so a missed or false minimap marker never decides on its own.
+                        minimap_allies = perception.minimap("ally")
+                        if minimap_allies:
+                            pan_to_minimap(pick_minimap_ally(minimap_allies, perception.minimap("enemy")))
+                            move_mouse_percent(SCREEN_CENTER[0], SCREEN_CENTER[1])
+                            if screen_manager.get_perception(fresh=True).allies:
+                                click_percent(SCREEN_CENTER[0], SCREEN_CENTER[1], button="right")
+                                send_keybind("evtCastSpell2", _keybinds)
+                                time.sleep(3) # Wait for attach animation
+                                if screen_manager.get_perception(fresh=True).attached_ally:
+                                    logging.info("Attached to an ally found on the minimap.")
+                                    attached = True
+                                    break
                         logging.info("No allies found, recalling.")
                         send_keybind("evtUseItem7", _keybinds)
                         time.sleep(9)
@@ -155,11 +171,12 @@ def run_game_loop(stop_event):
             time.sleep(0.1)
             #  Periodically check if currently attached ally is dead
             send_keybind("evtCameraSnap", _keybinds, press_time=0.2)
-            if not find_attached_ally_location(screen_manager.get_latest_frame()):
+            perception = screen_manager.get_perception(fresh=True)
+            if not perception.attached_ally:
                 attached = False
                 logging.info("Detached from ally.")
                 # Logic after detaching due to ally death or ally recall
-                enemy = find_enemy_locations(screen_manager.get_latest_frame())
+                enemy = perception.enemies
                 if enemy:
                     send_keybind("evtCameraSnap", _keybinds, press_time=0.2)
                     retreat(SCREEN_CENTER, enemy[0])
@@ -168,14 +185,16 @@ def run_game_loop(stop_event):
                     # Move out of ally if they haven't moved yet
                     move_random_offset(SCREEN_CENTER, 20)
                     time.sleep(1)
+                perception = screen_manager.get_perception(fresh=True)
             # Attached ally logic
-            enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
+            enemy_locations = perception.enemies
             if enemy_locations:
                 last_afk_check_time = time.time()
                 # check enemy relative location
                 send_keybind("evtCameraSnap", _keybinds, press_time=0.2)
-                enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
-                attached_ally_location = find_attached_ally_location(screen_manager.get_latest_frame())
+                perception = screen_manager.get_perception(fresh=True)
+                enemy_locations = perception.enemies
+                attached_ally_location = perception.attached_ally
                 if attached_ally_location:
                     for enemy_location in enemy_locations: 
                         distance_to_enemy = get_game_distance(attached_ally_location, enemy_location)
@@ -190,7 +209,7 @@ def run_game_loop(stop_event):
                                 send_keybind(item_key, _keybinds)
                             # Track Q
                             time.sleep(0.5)
-                            enemy_locations = find_enemy_locations(screen_manager.get_latest_frame())
+                            enemy_locations = screen_manager.get_perception(fresh=True).enemies
                             if enemy_locations:
                                 move_mouse_percent(enemy_locations[0][0], enemy_locations[0][1])
                             break
\ No newline at end of file
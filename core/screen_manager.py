@@ -1,23 +1,43 @@
 import logging
-import time
+import threading
 import os
 import cv2
-import dxcam
+from core.constants import FRAME_BUFFER_SLOTS, SCREEN_HEIGHT, SCREEN_WIDTH
+from core.frame_sources import FrameRing, create_frame_source
+from core.perception_manager import PerceptionManager
+from utils.config_utils import load_settings
+from utils.cv_utils import ChampionTracker, DetectorContext, FramePerception, RegionChangeTracker, get_capture_transform
 
 
 class ScreenManager:
     """
-    DXGI-based screen capture manager using `dxcam`.
-    Does NOT lock frame updates — latest frame may be corrupted if read during update.
+    Screen capture manager over a FrameSource: DXGI capture using `dxcam` by default, or a
+    recorded or synthetic replay, see `core/frame_sources.py`.
+    Captured frames are copied into a FrameRing, so a leased frame never changes while it is read, and
+    consumers can wait for the next frame by its sequence number instead of polling.
     """
 
-    def __init__(self):
+    def __init__(self, frame_source=None):
         """
         Initialize the ScreenManager and begins capturing frames.
         Args:
-            target_fps (int): Frames per second to capture.
+            frame_source (FrameSource, optional): capture backend. Defaults to `General.frame_source`.
         """
-        self._camera = dxcam.create(output_color="BGR")
+        self._camera = frame_source if frame_source is not None else create_frame_source()
+        self._capture = get_capture_transform()
+        _, general = load_settings()
+        self._frames = FrameRing(general.get("frame_buffer_slots", FRAME_BUFFER_SLOTS), self._capture.scale)
+        if self._capture.scale < 1:
+            logging.warning(
+                "Capture scale %.2f: the color-pair detectors match 1 px borders and are unreliable on downscaled frames.",
+                self._capture.scale,
+            )
+        self._detector_context = DetectorContext()
+        self._champion_tracker = ChampionTracker()
+        self._region_changes = RegionChangeTracker()
+        # Frame leased by the latest FramePerception, released when the next one replaces it
+        self._perception_frame = None
+        self._perception_manager = None
 
 
     def is_capturing(self):
@@ -27,20 +47,36 @@ class ScreenManager:
         return self._camera.is_capturing
     
 
-    def start_camera(self, target_fps=60):
+    def start_camera(self, target_fps=60, vision_thread=None):
         """
-        Starts the capture thread.
+        Starts the capture thread, and the vision thread if enabled.
+        Args:
+            target_fps (int): Frames per second to capture.
+            vision_thread (bool, optional): Analyze frames on a PerceptionManager thread.
+                Defaults to `General.vision_thread`.
         """
         
-        self._camera.start(target_fps=target_fps)
-        while self._camera.get_latest_frame() is None:
-            time.sleep(0.01)
+        self._camera.start(target_fps=target_fps, region=self._capture_region(), on_frame=self._frames.put)
+        while self._frames.wait_for_frame(0, timeout=1.0) is None:
+            logging.debug("Waiting for the first captured frame.")
+
+        if vision_thread is None:
+            _, general = load_settings()
+            vision_thread = general.get("vision_thread", False)
+        if vision_thread:
+            self._perception_manager = PerceptionManager(threading.Event(), self)
+            self._perception_manager.start_vision_thread()
 
 
     def stop_camera(self):
         """
-        Stops the capture thread and releases resources.
+        Stops the vision and capture threads and releases resources.
         """
+        if self._perception_manager:
+            self._perception_manager.stop_vision_thread()
+            self._perception_manager = None
+        self._frames.release(self._perception_frame)
+        self._perception_frame = None
         if self._camera:
             self._camera.stop()
             del self._camera
@@ -48,17 +84,141 @@ class ScreenManager:
             logging.info("ScreenManager camera is not running, nothing to stop.")
 
 
+    def _capture_region(self):
+        """
+        Returns the captured screen region, or None for the whole screen.
+        """
+        region = tuple(self._capture[:4])
+        return None if region == (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT) else region
+
+
+    def _downscale(self, frame):
+        """
+        Resizes a captured frame by the capture scale, see `General.capture`.
+        """
+        if frame is None or self._capture.scale == 1:
+            return frame
+        H, W = self._capture.frame_shape
+        return cv2.resize(frame, (W, H), interpolation=cv2.INTER_AREA)
+
+
+    def get_capture_transform(self):
+        """
+        Returns the CaptureTransform between captured frames and the screen, see `configure_capture`.
+        """
+        return self._capture
+
+
     def get_latest_frame(self):
         """
-        Returns the latest captured frame.
+        Returns a copy of the latest captured frame, cropped to the capture region and downscaled
+        by the capture scale, or None before the first frame.
+        """
+        captured = self.get_latest_capture()
+        return captured.frame if captured is not None else None
+
+
+    def get_latest_capture(self):
+        """
+        Returns the latest frame with its sequence number and capture time, see CapturedFrame.
+        The frame is a copy the caller may keep.
         """
-        return self._camera.get_latest_frame()
+        captured = self._frames.latest(lease=True)
+        if captured is None:
+            return None
+        try:
+            return captured._replace(frame=captured.frame.copy())
+        finally:
+            self._frames.release(captured)
+
+
+    def wait_for_frame(self, after_seq=0, timeout=1.0, latest=True, lease=False):
+        """
+        Waits for a frame captured after the one with sequence number `after_seq`, so each frame
+        is processed once, see FrameRing.wait_for_frame.
+        Args:
+            lease (bool): keep the frame's buffer from being rewritten until `release_frame` is called.
+        Returns:
+            CapturedFrame | None: the frame, or None on timeout.
+        """
+        return self._frames.wait_for_frame(after_seq, timeout, latest, lease)
+
+
+    def release_frame(self, captured):
+        """
+        Releases a frame leased with `wait_for_frame(lease=True)`, see FrameRing.release.
+        """
+        self._frames.release(captured)
+
+
+    def get_perception(self, fresh=False):
+        """
+        Returns the detections of the latest frame.
+        With the vision thread running and `fresh` unset, this is the latest DetectionSnapshot and
+        does not wait for detection.
+        Otherwise it is a FramePerception bound to the latest captured frame, or with `fresh` to the
+        next one. Its detections are computed lazily on the caller's thread and cached, so only the
+        detectors the caller reads run, without waiting for a full snapshot. Call this again whenever
+        the caller wants a fresh frame. The frame stays leased until the next call replaces it.
+        Detector buffers, champion tracks and region fingerprints are shared between calls,
+        see DetectorContext, ChampionTracker and RegionChangeTracker.
+        Args:
+            fresh (bool): Wait for a frame captured after this call, e.g. to see the result of an action.
+        Returns:
+            DetectionSnapshot | FramePerception: detections with the same lookups either way.
+        """
+        if self._perception_manager is not None and not fresh:
+            snapshot = self._perception_manager.get_snapshot()
+            if snapshot is None:
+                snapshot = self._perception_manager.wait_for_snapshot()
+            if snapshot is not None:
+                return snapshot
+        captured = None
+        if fresh:
+            captured = self._frames.wait_for_frame(self._frames.sequence, timeout=1.0, lease=True)
+            if captured is None:
+                logging.debug("No new frame within 1 s, using the latest one.")
+        if captured is None:
+            captured = self._frames.latest(lease=True)
+        self._frames.release(self._perception_frame)
+        self._perception_frame = captured
+        if captured is None:
+            return FramePerception(None, self._detector_context, self._champion_tracker, changes=self._region_changes)
+        return FramePerception(
+            captured.frame,
+            self._detector_context,
+            self._champion_tracker,
+            captured.timestamp,
+            self._region_changes,
+        )
     
+
+    def get_detector_stats(self):
+        """
+        Returns the detector buffer allocation counters, see DetectorContext.get_stats.
+        """
+        return self._detector_context.get_stats()
+
+
+    def get_tracker_stats(self):
+        """
+        Returns the champion tracker update counters, see ChampionTracker.get_stats.
+        """
+        return self._champion_tracker.get_stats()
+
+
+    def get_region_stats(self):
+        """
+        Returns how often UI detectors were skipped on unchanged regions, see RegionChangeTracker.get_stats.
+        """
+        return self._region_changes.get_stats()
+
+
     def grab(self):
         """
         Captures and returns the current frame without needing to start the camera.
         """
-        return self._camera.grab()
+        return self._downscale(self._camera.grab(region=self._capture_region()))
     
 
     def save_screenshot(self, file_name="screenshot"):
@@ -2,6 +2,8 @@
 import logging
 import threading
 import winsound
+from utils.config_utils import load_detector_profile
+from utils.cv_utils import apply_detector_profile
 from utils.general_utils import enable_logging, listen_for_exit
 from core.menu import show_menu  
 from core.lcu_manager import LCUManager
@@ -45,6 +47,8 @@ if __name__ == "__main__":
     Handles menu navigation and starts the connector.
     """
     enable_logging()
+    # Tuned detector parameters, see tools/tune_detectors.py
+    apply_detector_profile(load_detector_profile())
     listen_for_exit(shutdown)
     show_menu(run_script)
 
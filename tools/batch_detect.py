@@ -0,0 +1,212 @@
+"""
+Offline batch detection over recorded sessions.
+
+Streams frames from a recording directory (*.png, sorted by name) or a .npy stack of shape (N, H, W, 3),
+runs a detector backend (see `register_detector_backend` in `utils/cv_utils.py`) on every frame in a
+process pool and writes the detections as columnar arrays to a compressed .npz file:
+- frame, detector, x, y: one entry per detection (first hit only for UI detectors), detector indexes `detectors`
+- detectors: detector names
+- sources: frame file names, or the stack path plus index
+- latency_ms: detection time of every frame
+Frames are read by the worker processes, so only indices and paths are sent between processes.
+Usage: python tools/batch_detect.py data/session_01 --output session_01.npz [--workers 8] [--chunk-size 64]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import cv2
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from core.constants import CHAMPION_DETECTORS, UI_DETECTORS
+from utils import cv_utils
+
+
+def list_frames(source):
+    """
+    Lists the frames of a recording.
+    Args:
+        source (str): directory of *.png frames or path of a .npy stack.
+    Returns:
+        list[str]: one source name per frame.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.png")))
+    if source.endswith(".npy"):
+        stack = np.load(source, mmap_mode="r")
+        if stack.ndim != 4 or stack.shape[3] != 3:
+            raise ValueError(f"Expected a (N, H, W, 3) stack, got {stack.shape}")
+        return [f"{source}[{i}]" for i in range(stack.shape[0])]
+    raise ValueError(f"Unsupported recording: {source}")
+
+
+# Per-process state, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(source, backend, names, settings):
+    """
+    Sets up a worker process: opens the recording and selects the backend.
+    """
+    # Each process already runs in parallel, band-parallel threads would only compete for the same cores
+    cv_utils.configure_detectors(**dict(settings, detection_workers=1))
+    _worker["stack"] = np.load(source, mmap_mode="r") if source.endswith(".npy") else None
+    _worker["detect"] = cv_utils.get_detector_backends()[backend]
+    _worker["names"] = names
+
+
+def _load_frame(source):
+    """
+    Reads one frame by its source name, see list_frames.
+    """
+    stack = _worker["stack"]
+    if stack is None:
+        return cv2.imread(source)
+    index = int(source[source.rindex("[") + 1:-1])
+    return np.ascontiguousarray(stack[index])
+
+
+def _detect_chunk(start, sources):
+    """
+    Runs the backend on a chunk of consecutive frames.
+    Returns:
+        tuple: (start, columnar detections of the chunk, per-frame latency in milliseconds)
+    """
+    names = _worker["names"]
+    frames, detectors, xs, ys = [], [], [], []
+    latency = np.zeros(len(sources), dtype=np.float32)
+    for offset, source in enumerate(sources):
+        frame = _load_frame(source)
+        if frame is None:
+            latency[offset] = np.nan
+            continue
+        t0 = time.perf_counter()
+        results = _worker["detect"](frame)
+        latency[offset] = (time.perf_counter() - t0) * 1000
+        for detector_id, name in enumerate(names):
+            locations = results.get(name, ())
+            if name in UI_DETECTORS:
+                # Like find_augment_location and friends, UI detectors report their first hit
+                locations = locations[:1]
+            for x, y in locations:
+                frames.append(start + offset)
+                detectors.append(detector_id)
+                xs.append(x)
+                ys.append(y)
+    columns = {
+        "frame": np.asarray(frames, dtype=np.int32),
+        "detector": np.asarray(detectors, dtype=np.uint8),
+        "x": np.asarray(xs, dtype=np.int32),
+        "y": np.asarray(ys, dtype=np.int32),
+    }
+    return start, columns, latency
+
+
+def run(source, output, backend="default", names=None, workers=None, chunk_size=64, report_every=2.0):
+    """
+    Runs the detectors over a recording and writes the detections to `output`.
+    Args:
+        source (str): directory of *.png frames or path of a .npy stack.
+        output (str): .npz output path.
+        backend (str): registered detector backend name.
+        names (list, optional): CHAMPION_DETECTORS and UI_DETECTORS names to keep. Keeps all by default.
+        workers (int, optional): worker processes. Defaults to the CPU count.
+        chunk_size (int): frames per work unit.
+        report_every (float): seconds between progress lines.
+    Returns:
+        dict: frame count, detection count, wall time and frames per second.
+    """
+    sources = list_frames(source)
+    names = list(names) if names else list(CHAMPION_DETECTORS) + list(UI_DETECTORS)
+    workers = workers or os.cpu_count() or 1
+    chunks = [(start, sources[start:start + chunk_size]) for start in range(0, len(sources), chunk_size)]
+    settings = cv_utils.get_detector_settings()
+
+    parts = {}
+    latency = np.full(len(sources), np.nan, dtype=np.float32)
+    done = 0
+    start_time = time.perf_counter()
+    last_report = start_time
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(source, backend, names, settings)) as pool:
+        # Keep a bounded number of chunks in flight, so long recordings are streamed instead of queued at once
+        pending = set()
+        queue = iter(chunks)
+        for chunk in queue:
+            pending.add(pool.submit(_detect_chunk, *chunk))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk_start, columns, chunk_latency = future.result()
+                parts[chunk_start] = columns
+                latency[chunk_start:chunk_start + len(chunk_latency)] = chunk_latency
+                done += len(chunk_latency)
+                next_chunk = next(queue, None)
+                if next_chunk is not None:
+                    pending.add(pool.submit(_detect_chunk, *next_chunk))
+
+            now = time.perf_counter()
+            if now - last_report >= report_every or not pending:
+                last_report = now
+                print(
+                    f"{done}/{len(sources)} frames  {done / (now - start_time):8.1f} frames/s",
+                    file=sys.stderr,
+                )
+
+    elapsed = time.perf_counter() - start_time
+    ordered = [parts[start] for start in sorted(parts)]
+    columns = {
+        key: np.concatenate([part[key] for part in ordered]) if ordered else np.empty(0, dtype=np.int32)
+        for key in ("frame", "detector", "x", "y")
+    }
+    np.savez_compressed(
+        output,
+        detectors=np.asarray(names),
+        sources=np.asarray(sources),
+        latency_ms=latency,
+        **columns,
+    )
+    return {
+        "frames": len(sources),
+        "detections": int(columns["frame"].size),
+        "seconds": elapsed,
+        "frames_per_second": len(sources) / elapsed if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the cv_utils detectors over a recorded session.")
+    parser.add_argument("source", help="directory of *.png frames or a .npy stack of shape (N, H, W, 3)")
+    parser.add_argument("--output", required=True, help=".npz output path")
+    parser.add_argument("--backend", default="default", help="detector backend, see register_detector_backend")
+    parser.add_argument("--detectors", default="", help="comma separated subset of detector names")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--chunk-size", type=int, default=64, help="frames per work unit")
+    args = parser.parse_args()
+
+    backends = cv_utils.get_detector_backends()
+    if args.backend not in backends:
+        parser.error(f"unknown backend: {args.backend}, choose from {', '.join(backends)}")
+    names = [name for name in args.detectors.split(",") if name]
+    unknown = [name for name in names if name not in CHAMPION_DETECTORS and name not in UI_DETECTORS]
+    if unknown:
+        parser.error(f"unknown detectors: {', '.join(unknown)}")
+
+    summary = run(args.source, args.output, args.backend, names, args.workers or None, args.chunk_size)
+    print(
+        f"{summary['frames']} frames, {summary['detections']} detections in {summary['seconds']:.1f}s "
+        f"({summary['frames_per_second']:.1f} frames/s) -> {args.output}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Latency benchmark for the detectors in `utils/cv_utils.py`.
+
+Runs every detector against a frame corpus and reports p50/p99 latency and allocations per call as JSON.
+With several --workers counts, also reports how throughput scales with band-parallel detection.
+Corpus:
+- assets/health_references.png and assets/augment_reference.png
+- recorded gameplay frames (*.png) in data/frames, or the directory passed with --frames
+- synthetic scenes with N health bars, UI elements and minimap markers at 1080p, 1440p and 4K
+  (utils/synthetic_utils.py)
+
+Runs on Linux without dxcam or win32.
+Usage: python tools/benchmark_detectors.py [--repeats 50] [--bars 8] [--workers 1,2,4,8] [--output bench.json]
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import numpy as np
+import cv2
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from core.constants import CHAMPION_DETECTORS, UI_TEMPLATES
+from utils import cv_utils
+from utils.synthetic_utils import SYNTHETIC_RESOLUTIONS, generate_scene
+
+
+ASSETS_DIR = os.path.join(_repo_root, "assets")
+FRAMES_DIR = os.path.join(_repo_root, "data", "frames")
+REFERENCE_FRAMES = ["health_references.png", "augment_reference.png"]
+
+
+def _reference_detector(name):
+    """
+    Returns a callable running the unfused `_find_adjacent_colors` reference for a champion detector.
+    """
+    det = CHAMPION_DETECTORS[name]
+
+    def run(frame):
+        return cv_utils._find_adjacent_colors(
+            frame, det["bgr_1"], det["bgr_2"], det["bgr_1_tolerance"], det["bgr_2_tolerance"],
+            det["run_length"], det["shift_axis"],
+        )
+    return run
+
+
+def _perception_detector(context, classify=None):
+    """
+    Returns a callable running every FramePerception detector on one shared DetectorContext.
+    """
+    def run(frame):
+        perception = cv_utils.FramePerception(frame, context, classify=classify)
+        return [perception.allies, perception.enemies, perception.player, perception.attached_ally,
+                perception.augment, perception.shop, perception.arena_exit]
+    return run
+
+
+def _template_detector(name):
+    """
+    Returns a callable finding a UI element by template matching instead of its color pair.
+    """
+    def run(frame):
+        return cv_utils.find_ui_locations(frame, name, method="template")
+    return run
+
+
+def _full_search_detector(detector):
+    """
+    Returns a callable running a single-result detector with the full search instead of the first-hit search.
+    """
+    def run(frame):
+        previous = cv_utils.get_detector_settings()["single_result_search"]
+        cv_utils.configure_detectors(single_result_search="full")
+        try:
+            return detector(frame)
+        finally:
+            cv_utils.configure_detectors(single_result_search=previous)
+    return run
+
+
+def get_detectors():
+    """
+    Returns the benchmarked detectors, name -> callable(frame).
+    """
+    detectors = {
+        "find_ally_locations": cv_utils.find_ally_locations,
+        "find_enemy_locations": cv_utils.find_enemy_locations,
+        "find_player_location": cv_utils.find_player_location,
+        "find_attached_ally_location": cv_utils.find_attached_ally_location,
+        "find_augment_location": cv_utils.find_augment_location,
+        "find_shop_location": cv_utils.find_shop_location,
+        "find_arena_exit_location": cv_utils.find_arena_exit_location,
+        "find_champion_locations": cv_utils.find_champion_locations,
+        "find_champion_detections": cv_utils.find_champion_detections,
+        "find_champion_detections[no fill]": lambda frame: cv_utils.find_champion_detections(frame, fill=False),
+        "frame_perception": _perception_detector(cv_utils.DetectorContext(), classify=False),
+        "frame_perception[scene gate]": _perception_detector(cv_utils.DetectorContext(), classify=True),
+        "classify_scene": cv_utils.classify_scene,
+        "find_minimap_markers": cv_utils.find_minimap_markers,
+    }
+    for name in CHAMPION_DETECTORS:
+        detectors[f"_find_adjacent_colors[{name}]"] = _reference_detector(name)
+    for name in cv_utils.SINGLE_RESULT_DETECTORS:
+        detectors[f"find_{name}_location[full search]"] = _full_search_detector(detectors[f"find_{name}_location"])
+    for name in UI_TEMPLATES:
+        detectors[f"find_{name}_location[template]"] = _template_detector(name)
+    return detectors
+
+
+def load_corpus(frames_dir=FRAMES_DIR, bars=8, resolutions=tuple(SYNTHETIC_RESOLUTIONS)):
+    """
+    Loads the reference, recorded and synthetic frames.
+    Args:
+        frames_dir (str): directory of recorded *.png frames. Skipped if missing.
+        bars (int): health bars per synthetic scene.
+        resolutions (iterable): SYNTHETIC_RESOLUTIONS names to generate.
+    Returns:
+        list[tuple]: (frame name, BGR frame)
+    """
+    corpus = []
+    for filename in REFERENCE_FRAMES:
+        frame = cv2.imread(os.path.join(ASSETS_DIR, filename))
+        if frame is not None:
+            corpus.append((filename, frame))
+
+    if frames_dir and os.path.isdir(frames_dir):
+        for path in sorted(glob.glob(os.path.join(frames_dir, "*.png"))):
+            frame = cv2.imread(path)
+            if frame is not None:
+                corpus.append((os.path.relpath(path, _repo_root), frame))
+
+    for resolution in resolutions:
+        width, height = SYNTHETIC_RESOLUTIONS[resolution]
+        frame, _ = generate_scene(
+            width, height, bars, ui=("augment", "shop", "arena_exit"), minimap={"ally": 4, "enemy": 5},
+        )
+        corpus.append((f"synthetic_{resolution}_{bars}bars", frame))
+    return corpus
+
+
+def _count_results(result):
+    """
+    Returns the number of (x, y) locations in a detector result.
+    """
+    if isinstance(result, tuple):
+        return 1
+    if isinstance(result, np.ndarray):
+        return len(result)
+    if isinstance(result, bool):
+        return int(result)
+    if isinstance(result, dict):
+        if "location" in result:
+            return 1
+        return sum(_count_results(r) for r in result.values())
+    if isinstance(result, list):
+        return sum(_count_results(r) for r in result)
+    return 0
+
+
+def benchmark(detector, frame, repeats=50, warmup=3):
+    """
+    Times a detector on one frame, then measures its allocations in a separate traced pass.
+    Args:
+        detector (callable): detector taking a BGR frame.
+        frame (np.ndarray): BGR frame.
+        repeats (int): timed calls.
+        warmup (int): untimed calls before timing.
+    Returns:
+        dict: latency percentiles in milliseconds and allocations per call.
+    """
+    for _ in range(warmup):
+        result = detector(frame)
+
+    timings = np.empty(repeats, dtype=np.float64)
+    for i in range(repeats):
+        start = time.perf_counter()
+        detector(frame)
+        timings[i] = time.perf_counter() - start
+    timings *= 1000
+
+    # Tracing slows every allocation down, so allocations are measured outside the timed loop
+    alloc_calls = max(1, min(repeats, 5))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        for _ in range(alloc_calls):
+            detector(frame)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "lineno") if stat.size_diff > 0)
+
+    return {
+        "calls": repeats,
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "mean_ms": float(timings.mean()),
+        "min_ms": float(timings.min()),
+        "peak_alloc_bytes": int(peak),
+        "retained_alloc_bytes_per_call": int(allocated / alloc_calls),
+        "results": _count_results(result),
+    }
+
+
+def _scaling(results):
+    """
+    Returns throughput and speedup over the lowest worker count for every (detector, frame).
+    """
+    baselines = {}
+    for entry in sorted(results, key=lambda e: e["workers"]):
+        baselines.setdefault((entry["detector"], entry["frame"]), entry["p50_ms"])
+
+    scaling = []
+    for entry in results:
+        baseline = baselines[(entry["detector"], entry["frame"])]
+        scaling.append({
+            "detector": entry["detector"],
+            "frame": entry["frame"],
+            "workers": entry["workers"],
+            "frames_per_second": 1000 / entry["p50_ms"] if entry["p50_ms"] else 0.0,
+            "speedup": baseline / entry["p50_ms"] if entry["p50_ms"] else 0.0,
+        })
+    return scaling
+
+
+def run(corpus, detectors, repeats=50, workers=(1,)):
+    """
+    Benchmarks every detector on every frame, once per detection worker count.
+    Returns:
+        dict: run metadata, one result entry per (workers, detector, frame) and throughput scaling.
+    """
+    results = []
+    previous = cv_utils.get_detector_settings()
+    try:
+        for worker_count in workers:
+            cv_utils.configure_detectors(detection_workers=worker_count)
+            for frame_name, frame in corpus:
+                for detector_name, detector in detectors.items():
+                    entry = {
+                        "detector": detector_name,
+                        "frame": frame_name,
+                        "resolution": f"{frame.shape[1]}x{frame.shape[0]}",
+                        "workers": worker_count,
+                    }
+                    entry.update(benchmark(detector, frame, repeats))
+                    results.append(entry)
+                    print(
+                        f"{worker_count:2d}w {detector_name:36s} {frame_name:36s} "
+                        f"p50 {entry['p50_ms']:8.3f} ms  p99 {entry['p99_ms']:8.3f} ms  "
+                        f"peak {entry['peak_alloc_bytes'] / 1e6:7.2f} MB",
+                        file=sys.stderr,
+                    )
+    finally:
+        cv_utils.configure_detectors(**previous)
+
+    meta = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeats": repeats,
+    }
+    meta.update(previous)
+    meta["detection_workers"] = list(workers)
+    return {"meta": meta, "results": results, "scaling": _scaling(results)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cv_utils detectors.")
+    parser.add_argument("--frames", default=FRAMES_DIR, help="directory of recorded *.png frames")
+    parser.add_argument("--repeats", type=int, default=50, help="timed calls per detector and frame")
+    parser.add_argument("--bars", type=int, default=8, help="health bars per synthetic scene")
+    parser.add_argument("--resolutions", default=",".join(SYNTHETIC_RESOLUTIONS),
+                        help="comma separated synthetic resolutions: " + ", ".join(SYNTHETIC_RESOLUTIONS))
+    parser.add_argument("--detectors", default="", help="comma separated subset of detector names")
+    parser.add_argument("--workers", default="1", help="comma separated detection worker counts, e.g. 1,2,4,8")
+    parser.add_argument("--output", default="", help="JSON output path, prints to stdout by default")
+    args = parser.parse_args()
+
+    resolutions = [r for r in args.resolutions.split(",") if r]
+    detectors = get_detectors()
+    if args.detectors:
+        wanted = args.detectors.split(",")
+        unknown = [name for name in wanted if name not in detectors]
+        if unknown:
+            parser.error(f"unknown detectors: {', '.join(unknown)}")
+        detectors = {name: detectors[name] for name in wanted}
+
+    workers = [int(w) for w in args.workers.split(",") if w]
+    report = run(load_corpus(args.frames, args.bars, resolutions), detectors, args.repeats, workers)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
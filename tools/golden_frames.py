@@ -0,0 +1,250 @@
+"""
+Golden-frame equivalence harness for the detector backends in `utils/cv_utils.py`.
+
+Every registered backend (see `register_detector_backend`) is compared against the `_find_adjacent_colors`
+reference on a labeled frame set:
+- assets/health_references.png and assets/augment_reference.png
+- recorded gameplay frames (*.png) in data/frames, or the directory passed with --frames
+- synthetic scenes at 1080p, 1440p and 4K, whose painted health bars double as ground truth for the reference
+
+Reports matches within a pixel tolerance, missed detections and false positives as JSON,
+and saves a diff overlay for every failing (backend, frame) pair.
+Exits with status 1 if any backend differs from the reference.
+Usage: python tools/golden_frames.py [--tolerance 2] [--backends fast,tracked] [--output report.json]
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+import cv2
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from core.constants import CHAMPION_DETECTORS, UI_DETECTORS
+from utils import cv_utils
+from utils.synthetic_utils import SYNTHETIC_RESOLUTIONS, generate_scene
+
+
+ASSETS_DIR = os.path.join(_repo_root, "assets")
+FRAMES_DIR = os.path.join(_repo_root, "data", "frames")
+DIFF_DIR = os.path.join(_repo_root, "data", "golden_diffs")
+REFERENCE_FRAMES = ["health_references.png", "augment_reference.png"]
+
+# Overlay colors (BGR)
+EXPECTED_COLOR = (0, 255, 0)
+MISSED_COLOR = (0, 255, 255)
+FALSE_POSITIVE_COLOR = (0, 0, 255)
+
+
+def load_frames(frames_dir=FRAMES_DIR, seeds=3, bars=8):
+    """
+    Loads the labeled frame set.
+    Args:
+        frames_dir (str): directory of recorded *.png frames. Skipped if missing.
+        seeds (int): synthetic scenes per resolution.
+        bars (int): health bars per synthetic scene.
+    Returns:
+        list[tuple]: (frame name, BGR frame, labels) where labels is name -> list of (x, y),
+            or None for frames without ground truth.
+    """
+    frames = []
+    for filename in REFERENCE_FRAMES:
+        frame = cv2.imread(os.path.join(ASSETS_DIR, filename))
+        if frame is not None:
+            frames.append((filename, frame, None))
+
+    if frames_dir and os.path.isdir(frames_dir):
+        for path in sorted(glob.glob(os.path.join(frames_dir, "*.png"))):
+            frame = cv2.imread(path)
+            if frame is not None:
+                frames.append((os.path.relpath(path, _repo_root), frame, None))
+
+    for resolution, (width, height) in SYNTHETIC_RESOLUTIONS.items():
+        for seed in range(seeds):
+            frame, truth = generate_scene(
+                width, height, bars, names=tuple(CHAMPION_DETECTORS), ui=tuple(UI_DETECTORS), seed=seed,
+            )
+            labels = {name: [] for name in list(CHAMPION_DETECTORS) + list(UI_DETECTORS)}
+            for item in truth:
+                labels[item["name"]].append(item["location"])
+            frames.append((f"synthetic_{resolution}_{seed}", frame, labels))
+    return frames
+
+
+def reference_locations(frame):
+    """
+    Runs the unfused `_find_adjacent_colors` reference for every detector.
+    Champion hits are collapsed to one location per health bar; UI detectors keep their first hit,
+    matching what the public find_* functions report.
+    Returns:
+        dict: name -> list of (x, y) locations with the detector offset applied.
+    """
+    results = {}
+    for name, det in list(CHAMPION_DETECTORS.items()) + list(UI_DETECTORS.items()):
+        hits = cv_utils._find_adjacent_colors(
+            frame, det["bgr_1"], det["bgr_2"], det["bgr_1_tolerance"], det["bgr_2_tolerance"],
+            det["run_length"], det["shift_axis"],
+        )
+        hits = cv_utils._offset_locations(hits, *det["offset"])
+        if name in CHAMPION_DETECTORS:
+            results[name] = [c["location"] for c in cv_utils.cluster_locations(hits)]
+        else:
+            results[name] = cv_utils.to_location_list(hits[:1])
+    return results
+
+
+def compare_locations(expected, actual, tolerance=2):
+    """
+    Greedily pairs expected and actual locations that are at most `tolerance` pixels apart.
+    Returns:
+        dict: matched count, largest matched error, missed and false positive locations.
+    """
+    candidates = []
+    for ei, (ex, ey) in enumerate(expected):
+        for ai, (ax, ay) in enumerate(actual):
+            error = max(abs(ex - ax), abs(ey - ay))
+            if error <= tolerance:
+                candidates.append((error, ei, ai))
+
+    used_expected, used_actual = set(), set()
+    max_error = 0
+    for error, ei, ai in sorted(candidates):
+        if ei in used_expected or ai in used_actual:
+            continue
+        used_expected.add(ei)
+        used_actual.add(ai)
+        max_error = max(max_error, error)
+
+    return {
+        "matched": len(used_expected),
+        "max_error": max_error,
+        "missed": [tuple(loc) for i, loc in enumerate(expected) if i not in used_expected],
+        "false_positives": [tuple(loc) for i, loc in enumerate(actual) if i not in used_actual],
+    }
+
+
+def compare_frame(expected, actual, tolerance=2):
+    """
+    Compares every detector of one frame.
+    Returns:
+        dict: name -> compare_locations result, only for detectors with misses or false positives.
+    """
+    failures = {}
+    for name, expected_locations in expected.items():
+        actual_locations = actual.get(name, [])
+        if name in UI_DETECTORS:
+            actual_locations = actual_locations[:1]
+        result = compare_locations(expected_locations, actual_locations, tolerance)
+        if result["missed"] or result["false_positives"]:
+            failures[name] = result
+    return failures
+
+
+def save_diff_overlay(frame, expected, failures, path):
+    """
+    Saves a copy of `frame` with expected (green), missed (yellow) and false positive (red) locations.
+    """
+    overlay = frame.copy()
+    radius = max(4, frame.shape[0] // 200)
+    for locations in expected.values():
+        for x, y in locations:
+            cv2.circle(overlay, (int(x), int(y)), radius, EXPECTED_COLOR, 1)
+    for name, failure in failures.items():
+        for x, y in failure["missed"]:
+            cv2.drawMarker(overlay, (int(x), int(y)), MISSED_COLOR, cv2.MARKER_CROSS, radius * 3, 2)
+            cv2.putText(overlay, f"missed {name}", (int(x) + radius, int(y)), cv2.FONT_HERSHEY_SIMPLEX, 0.4, MISSED_COLOR, 1)
+        for x, y in failure["false_positives"]:
+            cv2.drawMarker(overlay, (int(x), int(y)), FALSE_POSITIVE_COLOR, cv2.MARKER_TILTED_CROSS, radius * 3, 2)
+            cv2.putText(overlay, f"extra {name}", (int(x) + radius, int(y)), cv2.FONT_HERSHEY_SIMPLEX, 0.4, FALSE_POSITIVE_COLOR, 1)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cv2.imwrite(path, overlay)
+
+
+def _summarize(failures):
+    """
+    Returns missed and false positive totals of a compare_frame result.
+    """
+    return {
+        "missed": sum(len(f["missed"]) for f in failures.values()),
+        "false_positives": sum(len(f["false_positives"]) for f in failures.values()),
+    }
+
+
+def run(frames, backends, tolerance=2, diff_dir=DIFF_DIR):
+    """
+    Compares every backend against the reference on every frame.
+    Returns:
+        dict: per-backend totals, per-frame failures and the reference's own score against the labels.
+    """
+    report = {"tolerance": tolerance, "labels": [], "backends": {}}
+    for name in backends:
+        report["backends"][name] = {"frames": 0, "failed_frames": 0, "missed": 0, "false_positives": 0, "failures": []}
+
+    for frame_name, frame, labels in frames:
+        expected = reference_locations(frame)
+        if labels is not None:
+            label_failures = compare_frame(labels, expected, tolerance)
+            report["labels"].append({"frame": frame_name, "failures": label_failures, **_summarize(label_failures)})
+
+        for backend_name, detect in backends.items():
+            summary = report["backends"][backend_name]
+            summary["frames"] += 1
+            failures = compare_frame(expected, detect(frame), tolerance)
+            if not failures:
+                continue
+
+            totals = _summarize(failures)
+            summary["failed_frames"] += 1
+            summary["missed"] += totals["missed"]
+            summary["false_positives"] += totals["false_positives"]
+            entry = {"frame": frame_name, "detectors": failures, **totals}
+            if diff_dir:
+                safe_name = os.path.splitext(frame_name.replace(os.sep, "_").replace("/", "_"))[0]
+                entry["overlay"] = os.path.join(diff_dir, f"{backend_name}_{safe_name}.png")
+                save_diff_overlay(frame, expected, failures, entry["overlay"])
+            summary["failures"].append(entry)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check detector backends against the reference implementation.")
+    parser.add_argument("--frames", default=FRAMES_DIR, help="directory of recorded *.png frames")
+    parser.add_argument("--tolerance", type=int, default=2, help="largest pixel error of a matching location")
+    parser.add_argument("--seeds", type=int, default=3, help="synthetic scenes per resolution")
+    parser.add_argument("--bars", type=int, default=8, help="health bars per synthetic scene")
+    parser.add_argument("--backends", default="", help="comma separated subset of backend names")
+    parser.add_argument("--diff-dir", default=DIFF_DIR, help="directory for diff overlays, empty to disable")
+    parser.add_argument("--output", default="", help="JSON report path, prints to stdout by default")
+    args = parser.parse_args()
+
+    backends = cv_utils.get_detector_backends()
+    if args.backends:
+        wanted = args.backends.split(",")
+        unknown = [name for name in wanted if name not in backends]
+        if unknown:
+            parser.error(f"unknown backends: {', '.join(unknown)}")
+        backends = {name: backends[name] for name in wanted}
+
+    report = run(load_frames(args.frames, args.seeds, args.bars), backends, args.tolerance, args.diff_dir)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    for name, summary in report["backends"].items():
+        status = "ok" if not summary["failed_frames"] else "FAILED"
+        print(
+            f"{name:12s} {status:6s} {summary['failed_frames']}/{summary['frames']} frames failed, "
+            f"{summary['missed']} missed, {summary['false_positives']} false positives",
+            file=sys.stderr,
+        )
+    sys.exit(1 if any(s["failed_frames"] for s in report["backends"].values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Auto-tuner for the color-pair detector parameters in `core/constants.py`.
+
+Sweeps bgr_1_tolerance, bgr_2_tolerance and run_length per detector over a labeled frame set, measuring
+accuracy (precision and recall against the labels) and latency for every parameter set.
+Reports the Pareto-optimal sets and writes the fastest set that meets the accuracy bar to the
+detector profile (config/detector_profile.json), which main.py applies at startup, see `apply_detector_profile`.
+shift_axis is part of what a detector looks for, so it is not swept. Detectors sharing a border color
+share one border mask, so their bgr_1_tolerance is only swept with --split-borders.
+
+Labeled frames:
+- synthetic scenes at 1080p, 1440p and 4K, with per-pixel capture noise (--noise) so exact colors are not free
+- recorded frames (*.png) in data/frames with labels in data/frames/labels.json:
+  {"frame.png": {"enemy": [[x, y], ...], ...}}, locations as the find_* functions report them
+
+Synthetic scenes only approximate the game's colors, so the profile is only written when recorded frames
+are labeled, or with --allow-synthetic.
+Usage: python tools/tune_detectors.py [--detectors enemy,ally] [--min-recall 0.99] [--min-precision 0.99] [--dry-run]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import numpy as np
+import cv2
+
+_repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if _repo_root not in sys.path:
+    sys.path.insert(0, _repo_root)
+
+from core.constants import CHAMPION_DETECTORS, UI_DETECTORS
+from utils import cv_utils
+from utils.config_utils import DETECTOR_PROFILE_PATH, load_detector_profile, save_detector_profile
+from utils.synthetic_utils import SYNTHETIC_RESOLUTIONS, generate_scene
+from tools.golden_frames import compare_locations
+
+
+FRAMES_DIR = os.path.join(_repo_root, "data", "frames")
+LABELS_FILE = "labels.json"
+SYNTHETIC_PREFIX = "synthetic_"
+
+# Swept values per parameter
+DEFAULT_TOLERANCES = (0, 1, 2, 3, 4, 6, 8)
+DEFAULT_RUN_LENGTHS = {
+    "champion": (2, 3, 4, 5, 6),
+    "ui": (1, 2, 3),
+}
+
+
+def load_labeled_frames(frames_dir=FRAMES_DIR, seeds=2, bars=8, noise=2, resolutions=tuple(SYNTHETIC_RESOLUTIONS)):
+    """
+    Loads the labeled frame set.
+    Args:
+        frames_dir (str): directory of recorded *.png frames and their labels.json. Skipped if missing.
+        seeds (int): synthetic scenes per resolution.
+        bars (int): health bars per synthetic scene.
+        noise (int): largest per-channel noise added to every synthetic pixel.
+        resolutions (iterable): SYNTHETIC_RESOLUTIONS names to generate.
+    Returns:
+        list[tuple]: (frame name, BGR frame, labels) where labels is name -> list of (x, y).
+    """
+    frames = []
+    labels_path = os.path.join(frames_dir, LABELS_FILE) if frames_dir else ""
+    if labels_path and os.path.exists(labels_path):
+        with open(labels_path, "r", encoding="utf-8") as fh:
+            recorded = json.load(fh)
+        for filename, labels in sorted(recorded.items()):
+            frame = cv2.imread(os.path.join(frames_dir, filename))
+            if frame is not None:
+                frames.append((filename, frame, {name: [tuple(loc) for loc in locs] for name, locs in labels.items()}))
+
+    rng = np.random.default_rng(0)
+    for resolution in resolutions:
+        width, height = SYNTHETIC_RESOLUTIONS[resolution]
+        for seed in range(seeds):
+            frame, truth = generate_scene(
+                width, height, bars, names=tuple(CHAMPION_DETECTORS), ui=tuple(UI_DETECTORS), seed=seed,
+            )
+            if noise:
+                jitter = rng.integers(-noise, noise + 1, frame.shape, dtype=np.int16)
+                frame = np.clip(frame.astype(np.int16) + jitter, 0, 255).astype(np.uint8)
+            labels = {name: [] for name in list(CHAMPION_DETECTORS) + list(UI_DETECTORS)}
+            for item in truth:
+                labels[item["name"]].append(item["location"])
+            frames.append((f"{SYNTHETIC_PREFIX}{resolution}_{seed}", frame, labels))
+    return frames
+
+
+def evaluate(name, params, frames, repeats=3, tolerance=2):
+    """
+    Runs one detector with one parameter set over the labeled frames.
+    Args:
+        name (str): CHAMPION_DETECTORS or UI_DETECTORS name.
+        params (dict): DETECTOR_PROFILE_KEYS values to try.
+        frames (list): see load_labeled_frames.
+        repeats (int): timed runs per frame, the median counts.
+        tolerance (int): largest pixel error of a correct location.
+    Returns:
+        dict: params, precision, recall, raw hits and total median latency over the frames in milliseconds.
+    """
+    det = dict(CHAMPION_DETECTORS.get(name, UI_DETECTORS.get(name)), **params)
+    matched = expected_total = actual_total = raw_hits = 0
+    latency = 0.0
+    for _, frame, labels in frames:
+        if name not in labels:
+            continue
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            hits = cv_utils.find_adjacent_color_groups(frame, {name: det}, cache={})[name]
+            timings.append(time.perf_counter() - start)
+        latency += float(np.median(timings)) * 1000
+        raw_hits += len(hits)
+
+        if name in CHAMPION_DETECTORS:
+            actual = [c["location"] for c in cv_utils.cluster_locations(hits)]
+        else:
+            actual = cv_utils.to_location_list(hits[:1])
+        result = compare_locations(labels[name], actual, tolerance)
+        matched += result["matched"]
+        expected_total += len(labels[name])
+        actual_total += len(actual)
+
+    return {
+        "params": params,
+        "precision": matched / actual_total if actual_total else 1.0,
+        "recall": matched / expected_total if expected_total else 1.0,
+        "raw_hits": raw_hits,
+        "latency_ms": latency,
+    }
+
+
+def pareto_front(results):
+    """
+    Returns the results no other result beats on latency, precision and recall at once, fastest first.
+    """
+    def dominates(a, b):
+        better_or_equal = (
+            a["latency_ms"] <= b["latency_ms"] and a["precision"] >= b["precision"] and a["recall"] >= b["recall"]
+        )
+        strictly_better = (
+            a["latency_ms"] < b["latency_ms"] or a["precision"] > b["precision"] or a["recall"] > b["recall"]
+        )
+        return better_or_equal and strictly_better
+
+    front = [r for r in results if not any(dominates(other, r) for other in results)]
+    return sorted(front, key=lambda r: r["latency_ms"])
+
+
+def select(front, min_precision=0.99, min_recall=0.99):
+    """
+    Picks the fastest Pareto-optimal result that meets the accuracy bar.
+    Returns:
+        dict | None: the selected result, or None if no result is accurate enough.
+    """
+    for result in front:
+        if result["precision"] >= min_precision and result["recall"] >= min_recall:
+            return result
+    return None
+
+
+def shared_borders():
+    """
+    Returns the names of detectors whose border color and shift axis another detector also uses.
+    Those detectors share one border mask in find_adjacent_color_groups as long as their
+    bgr_1_tolerance stays the same.
+    """
+    borders = {}
+    for name, det in dict(CHAMPION_DETECTORS, **UI_DETECTORS).items():
+        borders.setdefault((tuple(det["bgr_1"]), det["shift_axis"]), []).append(name)
+    return {name for names in borders.values() if len(names) > 1 for name in names}
+
+
+def tune(name, frames, tolerances=DEFAULT_TOLERANCES, run_lengths=None, repeats=3,
+         min_precision=0.99, min_recall=0.99, split_border=True):
+    """
+    Sweeps every parameter set of one detector.
+    Args:
+        split_border (bool): also sweep bgr_1_tolerance. Otherwise it keeps its current value,
+            see shared_borders.
+    Returns:
+        dict: current parameters and their score, every result, the Pareto front and the selection.
+    """
+    det = CHAMPION_DETECTORS.get(name, UI_DETECTORS.get(name))
+    if run_lengths is None:
+        run_lengths = DEFAULT_RUN_LENGTHS["champion" if name in CHAMPION_DETECTORS else "ui"]
+    current = {key: det[key] for key in cv_utils.DETECTOR_PROFILE_KEYS}
+    border_tolerances = tolerances if split_border else (current["bgr_1_tolerance"],)
+
+    results = []
+    for tol_1, tol_2, run_length in itertools.product(border_tolerances, tolerances, run_lengths):
+        params = {"bgr_1_tolerance": tol_1, "bgr_2_tolerance": tol_2, "run_length": run_length}
+        results.append(evaluate(name, params, frames, repeats))
+        r = results[-1]
+        print(
+            f"{name:14s} tol {tol_1}/{tol_2} run {run_length}  precision {r['precision']:.3f}  "
+            f"recall {r['recall']:.3f}  {r['latency_ms']:8.2f} ms",
+            file=sys.stderr,
+        )
+
+    front = pareto_front(results)
+    return {
+        "current": evaluate(name, current, frames, repeats),
+        "results": results,
+        "pareto": front,
+        "selected": select(front, min_precision, min_recall),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune detector tolerances and run lengths on labeled frames.")
+    parser.add_argument("--detectors", default="", help="comma separated subset of detector names")
+    parser.add_argument("--frames", default=FRAMES_DIR, help="directory of recorded *.png frames and labels.json")
+    parser.add_argument("--seeds", type=int, default=2, help="synthetic scenes per resolution")
+    parser.add_argument("--bars", type=int, default=8, help="health bars per synthetic scene")
+    parser.add_argument("--noise", type=int, default=2, help="per-channel noise added to synthetic scenes")
+    parser.add_argument("--resolutions", default=",".join(SYNTHETIC_RESOLUTIONS),
+                        help="comma separated synthetic resolutions: " + ", ".join(SYNTHETIC_RESOLUTIONS))
+    parser.add_argument("--tolerances", default=",".join(str(t) for t in DEFAULT_TOLERANCES),
+                        help="comma separated color tolerances to sweep")
+    parser.add_argument("--run-lengths", default="", help="comma separated run lengths, defaults per detector type")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per parameter set and frame")
+    parser.add_argument("--min-precision", type=float, default=0.99, help="accuracy bar of the selected settings")
+    parser.add_argument("--min-recall", type=float, default=0.99, help="accuracy bar of the selected settings")
+    parser.add_argument("--profile", default=DETECTOR_PROFILE_PATH, help="detector profile to update")
+    parser.add_argument("--dry-run", action="store_true", help="report only, leave the profile unchanged")
+    parser.add_argument("--allow-synthetic", action="store_true",
+                        help="write the profile even if no recorded frames are labeled")
+    parser.add_argument("--split-borders", action="store_true",
+                        help="also sweep bgr_1_tolerance of detectors sharing a border mask")
+    parser.add_argument("--output", default="", help="JSON report path, prints to stdout by default")
+    args = parser.parse_args()
+
+    names = [n for n in args.detectors.split(",") if n] or list(CHAMPION_DETECTORS) + list(UI_DETECTORS)
+    unknown = [n for n in names if n not in CHAMPION_DETECTORS and n not in UI_DETECTORS]
+    if unknown:
+        parser.error(f"unknown detectors: {', '.join(unknown)}")
+    tolerances = [int(t) for t in args.tolerances.split(",") if t]
+    run_lengths = [int(r) for r in args.run_lengths.split(",") if r] or None
+    resolutions = [r for r in args.resolutions.split(",") if r]
+
+    frames = load_labeled_frames(args.frames, args.seeds, args.bars, args.noise, resolutions)
+    recorded = sum(1 for name, _, _ in frames if not name.startswith(SYNTHETIC_PREFIX))
+    if not recorded and not args.dry_run and not args.allow_synthetic:
+        parser.error(f"no labeled recorded frames in {args.frames}, refusing to write a profile tuned on "
+                     "synthetic scenes only; add labels, or pass --dry-run or --allow-synthetic")
+
+    shared = set() if args.split_borders else shared_borders()
+    report = {
+        name: tune(name, frames, tolerances, run_lengths, args.repeats, args.min_precision, args.min_recall,
+                   split_border=name not in shared)
+        for name in names
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+    profile = load_detector_profile(args.profile)
+    detectors = profile.setdefault("detectors", {})
+    for name, result in report.items():
+        selected = result["selected"]
+        current = result["current"]
+        if selected is None:
+            print(f"{name:14s} no settings meet the accuracy bar, keeping {current['params']}", file=sys.stderr)
+            continue
+        detectors[name] = selected["params"]
+        print(
+            f"{name:14s} {current['params']} {current['latency_ms']:.2f} ms -> "
+            f"{selected['params']} {selected['latency_ms']:.2f} ms "
+            f"(precision {selected['precision']:.3f}, recall {selected['recall']:.3f})",
+            file=sys.stderr,
+        )
+
+    # Detectors sharing a border color and tolerance share one border mask, see find_adjacent_color_groups
+    all_detectors = dict(CHAMPION_DETECTORS, **UI_DETECTORS)
+    borders = {}
+    for name, det in all_detectors.items():
+        tolerance = detectors.get(name, {}).get("bgr_1_tolerance", det["bgr_1_tolerance"])
+        borders.setdefault((tuple(det["bgr_1"]), det["shift_axis"]), {})[name] = tolerance
+    for (color, _), tolerances in borders.items():
+        if len(set(tolerances.values())) > 1:
+            print(f"Border color {color} now has different tolerances {tolerances}, "
+                  "those detectors no longer share a border mask", file=sys.stderr)
+
+    if not args.dry_run:
+        profile["meta"] = {
+            "frames": len(frames),
+            "recorded_frames": recorded,
+            "noise": args.noise,
+            "min_precision": args.min_precision,
+            "min_recall": args.min_recall,
+        }
+        save_detector_profile(profile, args.profile)
+        print(f"Wrote {args.profile}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import re
 
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), "..", "config")
 CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+DETECTOR_PROFILE_PATH = os.path.join(CONFIG_DIR, "detector_profile.json")
 
 def load_config(path=CONFIG_PATH):
     if not os.path.exists(path):
@@ -19,6 +20,21 @@ def save_config(config, path=CONFIG_PATH):
         json.dump(config, f, indent=4)
 
 
+def load_detector_profile(path=DETECTOR_PROFILE_PATH):
+    """Load tuned detector parameters written by tools/tune_detectors.py.
+    Returns an empty profile if the file does not exist."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_detector_profile(profile, path=DETECTOR_PROFILE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=4)
+
+
 def load_settings():
     config = load_config()
     parsed = config.get("Keybinds")
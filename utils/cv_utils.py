@@ -1,7 +1,41 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import cv2
 import os
-from core.constants import ALLY_HEALTH_RIGHT_COLOR, ARENA_EXIT_LOWER_COLOR, ARENA_EXIT_UPPER_COLOR, ATTACHED_ALLY_LEFT_COLOR, ATTACHED_ALLY_LEFT_COLOR, ATTACHED_ALLY_RIGHT_COLOR, AUGMENT_LOWER_COLOR, AUGMENT_UPPER_COLOR, ENEMY_HEALTH_RIGHT_COLOR, HEALTH_LEFT_COLOR, PLAYER_HEALTH_RIGHT_COLOR, SHOP_LOWER_COLOR, SHOP_UPPER_COLOR, THRESHHOLD
+from core.constants import (
+    CHAMPION_DETECTORS,
+    FIRST_HIT_BAND_SIZE,
+    HEALTH_BAR_CLUSTER_GAP,
+    HEALTH_BAR_END_COLOR,
+    HEALTH_BAR_FILL_CHROMA,
+    HEALTH_BAR_WIDTH,
+    MINIMAP_MARKERS,
+    MINIMAP_REGION,
+    REGION_FINGERPRINT_BAND_HEIGHT,
+    SCENE_DEAD_MAX_CHROMA,
+    SCENE_STATES,
+    SCENE_THUMBNAIL_SIZE,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    TRACKER_FULL_SCAN_INTERVAL,
+    TRACKER_MATCH_DISTANCE,
+    TRACKER_MAX_MISSES,
+    TRACKER_SEARCH_MARGIN,
+    UI_DETECTORS,
+    UI_REFERENCE_RESOLUTION,
+    UI_ROI_MISS_STREAK,
+    UI_TEMPLATE_COARSE_MARGIN,
+    UI_TEMPLATE_PYRAMID_SCALE,
+    UI_TEMPLATES,
+)
+from utils.config_utils import load_settings
+_keybinds, _general = load_settings()
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "..", "assets")
 
 
 # ===========================
@@ -9,13 +43,14 @@ from core.constants import ALLY_HEALTH_RIGHT_COLOR, ARENA_EXIT_LOWER_COLOR, AREN
 # ===========================
 
 
-def get_color_mask(img, color_bgr, tolerance=0):
+def get_color_mask(img, color_bgr, tolerance=0, dst=None):
     """Return a binary mask where pixels within `tolerance` of `color_bgr` are 255.
 
     Args:
         img (np.ndarray): BGR image.
         color_bgr (tuple/list/np.ndarray): BGR color to match.
         tolerance (int or tuple): scalar or per-channel tolerance.
+        dst (np.ndarray, optional): preallocated (H, W) uint8 output buffer.
 
     Returns:
         np.ndarray: single-channel mask (dtype=uint8) with binary values.
@@ -24,7 +59,7 @@ def get_color_mask(img, color_bgr, tolerance=0):
     col = np.array(color_bgr, dtype=np.int16)
     lower = np.clip(col - np.array(tolerance, dtype=np.int16), 0, 255).astype(np.uint8)
     upper = np.clip(col + np.array(tolerance, dtype=np.int16), 0, 255).astype(np.uint8)
-    return cv2.inRange(img, lower, upper)
+    return cv2.inRange(img, lower, upper, dst=dst)
 
 
 def save_color_mask(img, color_bgr, tolerance=0):
@@ -50,6 +85,475 @@ def save_color_mask(img, color_bgr, tolerance=0):
     return out_path
 
 
+# ===========================
+# Detector Buffers
+# ===========================
+
+
+class DetectorContext:
+    """
+    Preallocated intermediate buffers for the detector pipeline.
+    Buffers are keyed by purpose and shape, reused through OpenCV `dst=` and NumPy `out=` arguments,
+    and only reallocated when the frame resolution changes. Not thread-safe: use one context per thread.
+    Buffers handed out for one frame are overwritten by the next, so results must not keep references to them.
+    Also holds the per-element miss streaks of find_ui_locations, so each context keeps its own search state.
+    """
+
+    def __init__(self):
+        """
+        Initialize the DetectorContext with no buffers.
+        """
+        self._buffers = {}
+        self._frame_shape = None
+        self.ui_miss_streaks = {}
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.requests = 0
+
+
+    def prepare(self, frame_shape):
+        """
+        Binds the context to a frame shape. Drops every buffer and UI miss streak when the resolution changes.
+        Args:
+            frame_shape (tuple): shape of the frame about to be processed.
+        """
+        frame_shape = tuple(frame_shape[:2])
+        if frame_shape != self._frame_shape:
+            if self._frame_shape is not None:
+                logging.info("Detector resolution changed from %s to %s, reallocating buffers.", self._frame_shape, frame_shape)
+            self._buffers.clear()
+            self.ui_miss_streaks.clear()
+            self._frame_shape = frame_shape
+
+
+    def buffer(self, key, shape, dtype=np.uint8):
+        """
+        Returns the buffer for `key` with the given shape and dtype, allocating it on first use.
+        Contents are undefined; callers must fully overwrite what they read.
+        """
+        self.requests += 1
+        dtype = np.dtype(dtype)
+        full_key = (key, tuple(shape), dtype.str)
+        buf = self._buffers.get(full_key)
+        if buf is None:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[full_key] = buf
+            self.allocations += 1
+            self.allocated_bytes += buf.nbytes
+        return buf
+
+
+    def get_stats(self):
+        """
+        Returns buffer allocation counters, e.g. to assert that steady-state detection allocates no buffers.
+        Temporaries NumPy or OpenCV allocate outside the context are not counted here, see the
+        peak_alloc_bytes of tools/benchmark_detectors.py.
+        Returns:
+            dict: allocations, allocated_bytes, requests and the number of live buffers.
+        """
+        return {
+            "allocations": self.allocations,
+            "allocated_bytes": self.allocated_bytes,
+            "requests": self.requests,
+            "buffers": len(self._buffers),
+        }
+
+
+    def reset_stats(self):
+        """
+        Resets the allocation counters without dropping buffers.
+        """
+        self.allocations = 0
+        self.allocated_bytes = 0
+        self.requests = 0
+
+
+# ===========================
+# Detector Profile
+# ===========================
+
+
+# Detector parameters a profile may override
+DETECTOR_PROFILE_KEYS = ("bgr_1_tolerance", "bgr_2_tolerance", "run_length")
+
+
+def apply_detector_profile(profile):
+    """
+    Overrides CHAMPION_DETECTORS and UI_DETECTORS parameters with tuned values, see tools/tune_detectors.py.
+    Nothing is applied on import: the application calls this once at startup (main.py), before the
+    detectors run.
+    Args:
+        profile (dict): {"detectors": {name: {parameter: value}}} with DETECTOR_PROFILE_KEYS parameters.
+    Returns:
+        dict: name -> parameters that were changed.
+    """
+    applied = {}
+    for name, params in profile.get("detectors", {}).items():
+        det = CHAMPION_DETECTORS.get(name, UI_DETECTORS.get(name))
+        if det is None:
+            logging.warning("Detector profile names unknown detector '%s'", name)
+            continue
+        changed = {key: int(params[key]) for key in DETECTOR_PROFILE_KEYS if key in params}
+        det.update(changed)
+        applied[name] = changed
+    if applied:
+        # The lookup table is rebuilt from the new tolerances on its next use
+        global _color_classifier
+        _color_classifier = None
+        logging.info("Applied detector profile: %s", applied)
+    return applied
+
+
+# ===========================
+# Color Classification
+# ===========================
+
+
+def _color_key(color_bgr, tolerance=0):
+    """
+    Returns a hashable key for a (color, tolerance) pair with per-channel tolerance.
+    """
+    color = tuple(int(c) for c in color_bgr)
+    tol = tuple(int(t) for t in np.broadcast_to(np.array(tolerance), (3,)))
+    return (color, tol)
+
+
+class ColorClassifier:
+    """
+    Classifies every pixel of a BGR frame against all registered (color, tolerance) pairs at once.
+    The frame is viewed as packed 24-bit keys without copying and mapped through a 2^24 entry
+    lookup table, producing a single uint8 label image. Registered color boxes must not overlap.
+    """
+
+    def __init__(self):
+        """
+        Initialize the ColorClassifier with an empty lookup table (label 0 = unclassified).
+        """
+        self._lut = np.zeros(1 << 24, dtype=np.uint8)
+        self._labels = {}
+
+
+    def register(self, color_bgr, tolerance=0):
+        """
+        Registers a color and returns its label. Registering the same pair twice returns the same label.
+        Args:
+            color_bgr (tuple): BGR color to match.
+            tolerance (int or tuple): scalar or per-channel tolerance.
+        Returns:
+            int: label assigned to the color.
+        """
+        key = _color_key(color_bgr, tolerance)
+        if key in self._labels:
+            return self._labels[key]
+        if len(self._labels) >= 255:
+            raise ValueError("ColorClassifier supports at most 255 colors")
+
+        col = np.array(key[0], dtype=np.int16)
+        tol = np.array(key[1], dtype=np.int16)
+        lower = np.clip(col - tol, 0, 255)
+        upper = np.clip(col + tol, 0, 255) + 1
+
+        # Packed key = b | g << 8 | r << 16, so the table is indexed [r, g, b]
+        box = self._lut.reshape(256, 256, 256)[lower[2]:upper[2], lower[1]:upper[1], lower[0]:upper[0]]
+        if np.any(box):
+            raise ValueError(f"Color {key[0]} with tolerance {key[1]} overlaps a registered color")
+        label = len(self._labels) + 1
+        box[...] = label
+        self._labels[key] = label
+        return label
+
+
+    def get_label(self, color_bgr, tolerance=0):
+        """
+        Returns the label of a registered color, or None if it was not registered.
+        """
+        return self._labels.get(_color_key(color_bgr, tolerance))
+
+
+    def classify(self, img, context=None, key="labels"):
+        """
+        Returns the label image of a BGR frame.
+        Args:
+            img (np.ndarray): BGR image. Non-contiguous views (e.g. ROIs) are copied first.
+            context (DetectorContext, optional): provides the label, key and copy buffers.
+            key (hashable): context buffer key of the label image, unique per view that stays cached.
+        Returns:
+            np.ndarray: (H, W) uint8 label image.
+        """
+        H, W = img.shape[:2]
+        n = H * W
+        if not img.flags["C_CONTIGUOUS"]:
+            if context is None:
+                img = np.ascontiguousarray(img)
+            else:
+                copy = context.buffer("classify_copy", img.shape)
+                np.copyto(copy, img)
+                img = copy
+        if context is None:
+            labels = np.empty(n, dtype=np.uint8)
+        else:
+            labels = context.buffer(key, (n,))
+        if n == 0:
+            return labels.reshape(H, W)
+        flat = img.reshape(-1)
+
+        # Read 4 bytes every 3 bytes; the top byte belongs to the next pixel and is masked off.
+        # The last pixel has no 4th byte in the buffer, so it is looked up separately.
+        keys = np.ndarray((n - 1,), dtype="<u4", buffer=flat, strides=(3,))
+        masked_keys = None if context is None else context.buffer("packed_keys", (n - 1,), np.uint32)
+        np.take(self._lut, np.bitwise_and(keys, 0xFFFFFF, out=masked_keys), out=labels[:-1])
+        b, g, r = (int(v) for v in flat[-3:])
+        labels[-1] = self._lut[b | (g << 8) | (r << 16)]
+        return labels.reshape(H, W)
+
+
+    def get_mask(self, labels, label, dst=None):
+        """
+        Returns a binary mask (255 where labels == label), matching `get_color_mask` output.
+        """
+        return cv2.compare(labels, label, cv2.CMP_EQ, dst=dst)
+
+
+def _build_color_classifier():
+    """
+    Returns a ColorClassifier with the colors of every CHAMPION_DETECTORS and UI_DETECTORS entry.
+    """
+    classifier = ColorClassifier()
+    for det in list(CHAMPION_DETECTORS.values()) + list(UI_DETECTORS.values()):
+        for color, tolerance in ((det["bgr_1"], det["bgr_1_tolerance"]), (det["bgr_2"], det["bgr_2_tolerance"])):
+            try:
+                classifier.register(color, tolerance)
+            except ValueError as e:
+                # Tuned tolerances may overlap, those colors are masked with inRange instead
+                logging.warning("Color %s not added to the lookup table: %s", color, e)
+    return classifier
+
+
+# Only built when 'lut' classification is first used, the table takes 16 MB
+_color_classifier = None
+_color_classifier_lock = threading.Lock()
+
+
+def _get_color_classifier():
+    """
+    Returns the shared ColorClassifier, building it on first use.
+    """
+    global _color_classifier
+    classifier = _color_classifier
+    if classifier is None:
+        with _color_classifier_lock:
+            if _color_classifier is None:
+                _color_classifier = _build_color_classifier()
+            classifier = _color_classifier
+    return classifier
+
+
+# 'inrange' builds one cv2.inRange mask per color, 'lut' classifies the frame once per view
+# 'lut' measured slower than 'inrange' for the current detectors, see tools/benchmark_detectors.py
+_color_classification = _general.get("color_classification", "inrange")
+
+
+def _get_mask(img, color_bgr, tolerance, cache, view_key, context=None):
+    """
+    Returns a color mask for `img`, reading from the cached label image when the 'lut'
+    classification is enabled and the color is registered.
+    Args:
+        img (np.ndarray): BGR image (or view) to mask.
+        color_bgr (tuple): BGR color to match.
+        tolerance (int or tuple): scalar or per-channel tolerance.
+        cache (dict): per-frame cache.
+        view_key (tuple): identifies which view of the frame `img` is, e.g. (region, step).
+        context (DetectorContext, optional): provides the mask buffer.
+    Returns:
+        np.ndarray: single-channel mask (dtype=uint8) with binary values.
+    """
+    dst = None
+    if context is not None:
+        dst = context.buffer(("mask", _color_key(color_bgr, tolerance)) + view_key, img.shape[:2])
+    if _color_classification == "lut":
+        classifier = _get_color_classifier()
+        label = classifier.get_label(color_bgr, tolerance)
+        if label is not None:
+            labels_key = ("labels",) + view_key
+            labels = cache.get(labels_key)
+            if labels is None:
+                labels = classifier.classify(img, context, labels_key)
+                cache[labels_key] = labels
+            return classifier.get_mask(labels, label, dst)
+    return get_color_mask(img, color_bgr, tolerance=tolerance, dst=dst)
+
+
+def _shift_mask(mask, shift_axis='x', out=None):
+    """
+    Shift a mask by one pixel so each pixel lines up with its left or top neighbour.
+    Args:
+        mask (np.ndarray): single-channel mask.
+        shift_axis: 'x' to shift right by one column, 'y' to shift down by one row.
+        out (np.ndarray, optional): preallocated output buffer with the shape of mask.
+    Returns:
+        np.ndarray: shifted mask with the vacated border filled with zeros.
+    """
+    H, W = mask.shape
+    shift = 1
+    shifted = np.empty_like(mask) if out is None else out
+
+    if shift_axis == 'x':
+        # shift columns: move mask right by 1 pixel
+        shifted[:, :shift] = 0
+        if shift < W:
+            shifted[:, shift:] = mask[:, :-shift]
+    elif shift_axis == 'y':
+        # shift rows: move mask down by 1 pixel
+        shifted[:shift, :] = 0
+        if shift < H:
+            shifted[shift:, :] = mask[:-shift, :]
+    else:
+        raise ValueError(f"Invalid shift_axis: {shift_axis}")
+    return shifted
+
+
+# Shared empty result of the array-native search functions, read-only so no caller can grow it by accident
+_NO_LOCATIONS = np.empty((0, 2), dtype=np.int32)
+_NO_LOCATIONS.flags.writeable = False
+
+
+def to_location_list(locations):
+    """
+    Converts an (N, 2) int32 location array to the list of (x, y) tuples the public find_* functions return.
+    Args:
+        locations (np.ndarray): (x, y) rows, e.g. from find_adjacent_color_groups.
+    Returns:
+        list[tuple]: (x, y) locations as Python ints, in the same order.
+    """
+    return [tuple(location) for location in locations.tolist()]
+
+
+def _offset_locations(locations, dx, dy):
+    """
+    Returns an (N, 2) location array moved by (dx, dy), without changing `locations`.
+    """
+    if dx == 0 and dy == 0:
+        return locations
+    return locations + np.array((dx, dy), dtype=np.int32)
+
+
+def _find_runs_cumsum(hits, run_length=1, shift_axis='x', context=None):
+    """
+    Find every pixel that starts a run of `run_length` hits along the opposite axis of shift_axis.
+    Args:
+        hits (np.ndarray): single-channel mask of adjacent color hits.
+        run_length: minimum number of adjacent hits to validate a location.
+        shift_axis: 'x' for runs along columns, 'y' for runs along rows.
+        context (DetectorContext, optional): provides the int32 cumsum buffers.
+    Returns:
+        np.ndarray: (N, 2) int32 array of (x, y) locations (may be empty).
+    """
+    if context is None:
+        bin_mask = (hits > 0).astype(np.int32)
+
+        # For vertical adjacency (shift_axis == 'y') transpose so run detection logic stays the same
+        proc = bin_mask if shift_axis == "x" else bin_mask.T
+        Hp, Wp = proc.shape
+        if run_length > Hp:
+            return _NO_LOCATIONS
+
+        csum = np.vstack([np.zeros((1, Wp), dtype=np.int32), proc.cumsum(axis=0, dtype=np.int32)])
+        runs = csum[run_length:] - csum[:-run_length]
+        valid = runs == run_length
+    else:
+        proc = hits if shift_axis == "x" else hits.T
+        Hp, Wp = proc.shape
+        if run_length > Hp:
+            return _NO_LOCATIONS
+
+        bin_mask = np.greater(proc, 0, out=context.buffer("runs_binary", (Hp, Wp), np.bool_))
+        csum = context.buffer("runs_cumsum", (Hp + 1, Wp), np.int32)
+        csum[0] = 0
+        # Casting the bool mask inside cumsum would allocate a full-frame int32 temporary,
+        # so the mask is copied into the int32 buffer first and summed in place
+        np.copyto(csum[1:], bin_mask)
+        np.cumsum(csum[1:], axis=0, out=csum[1:])
+        runs = np.subtract(csum[run_length:], csum[:-run_length], out=context.buffer("runs_diff", (Hp - run_length + 1, Wp), np.int32))
+        valid = np.equal(runs, run_length, out=context.buffer("runs_valid", runs.shape, np.bool_))
+
+    # Every valid pixel is reported once, so the locations are unique without de-duplication
+    rows, cols = np.nonzero(valid)
+    if rows.size == 0:
+        return _NO_LOCATIONS
+    locations = np.empty((rows.size, 2), dtype=np.int32)
+    if shift_axis == 'x':
+        locations[:, 0] = cols
+        locations[:, 1] = rows
+    else:
+        # proc is transposed: original x = row, original y = column
+        locations[:, 0] = rows
+        locations[:, 1] = cols
+    return locations
+
+
+def _find_runs_erode(hits, run_length=1, shift_axis='x', context=None):
+    """
+    Same result as `_find_runs_cumsum`, computed with a uint8 erosion instead of an int32 cumulative sum.
+    A run_length x 1 kernel anchored at its first pixel keeps a hit only if the next run_length - 1
+    hits along the run axis are also set.
+    Args:
+        hits (np.ndarray): single-channel uint8 mask of adjacent color hits.
+        run_length: minimum number of adjacent hits to validate a location.
+        shift_axis: 'x' for runs along columns, 'y' for runs along rows.
+        context (DetectorContext, optional): provides the erosion output buffer.
+    Returns:
+        np.ndarray: (N, 2) int32 array of (x, y) locations (may be empty).
+    """
+    H, W = hits.shape
+    if shift_axis == 'x':
+        if run_length > H:
+            return _NO_LOCATIONS
+        kernel = np.ones((run_length, 1), dtype=np.uint8)
+    elif shift_axis == 'y':
+        if run_length > W:
+            return _NO_LOCATIONS
+        kernel = np.ones((1, run_length), dtype=np.uint8)
+    else:
+        raise ValueError(f"Invalid shift_axis: {shift_axis}")
+
+    if run_length == 1:
+        runs = hits
+    else:
+        dst = None if context is None else context.buffer("runs_eroded", hits.shape)
+        runs = cv2.erode(hits, kernel, dst=dst, anchor=(0, 0))
+
+    # Pixels outside the image count as set for erosion, so drop runs that would cross the edge
+    if shift_axis == 'x':
+        runs = runs[:H - run_length + 1]
+    else:
+        runs = runs[:, :W - run_length + 1]
+    if cv2.countNonZero(runs) == 0:
+        return _NO_LOCATIONS
+
+    # findNonZero returns row-major (x, y) points; shift_axis 'y' is ordered by column first,
+    # like the transposed cumsum search
+    pts = cv2.findNonZero(runs).reshape(-1, 2)
+    if shift_axis == 'y':
+        pts = pts[np.lexsort((pts[:, 1], pts[:, 0]))]
+    return pts
+
+
+# 'cumsum' (reference) or 'erode' run detection, see _find_runs
+_run_detection = _general.get("run_detection", "cumsum")
+
+
+def _find_runs(hits, run_length=1, shift_axis='x', context=None):
+    """
+    Find every pixel that starts a run of `run_length` hits along the opposite axis of shift_axis,
+    using the configured `run_detection` backend.
+    Returns:
+        np.ndarray: (N, 2) int32 array of (x, y) locations (may be empty).
+    """
+    if _run_detection == "erode":
+        return _find_runs_erode(hits, run_length, shift_axis, context)
+    return _find_runs_cumsum(hits, run_length, shift_axis, context)
+
+
 def _find_adjacent_colors(
     img,
     bgr_1,
@@ -70,7 +574,7 @@ def _find_adjacent_colors(
         run_length: minimum number of adjacent pixels along opposite axis of shift_axis to validate a pair.
         shift_axis: 'x' to search horizontally (adjacent columns), 'y' to search vertically (adjacent rows).
     Returns:
-        list[tuple]: list of (x, y) locations (may be empty).
+        np.ndarray: (N, 2) int32 array of (x, y) locations (may be empty).
     """
 
     # Build masks for both colors
@@ -80,143 +584,1800 @@ def _find_adjacent_colors(
     if mask_bgr_1 is None or mask_bgr_2 is None:
         raise ValueError("Two colors are required")
 
-    H, W = mask_bgr_1.shape
+    border_shifted = _shift_mask(mask_bgr_1, shift_axis)
+    hits = cv2.bitwise_and(mask_bgr_2, border_shifted)
+    return _find_runs_cumsum(hits, run_length, shift_axis)
 
-    found_locations = []
 
-    shift = 1
-    border_shifted = np.zeros_like(mask_bgr_1)
+def _match_color(pixels, color_bgr, tolerance=0):
+    """
+    Vectorized equivalent of `get_color_mask` for an arbitrary array of BGR pixels.
+    Args:
+        pixels (np.ndarray): array of shape (..., 3).
+        color_bgr (tuple): BGR color to match.
+        tolerance (int or tuple): scalar or per-channel tolerance.
+    Returns:
+        np.ndarray: boolean array of shape pixels.shape[:-1].
+    """
+    diff = np.abs(pixels.astype(np.int16) - np.array(color_bgr, dtype=np.int16))
+    return np.all(diff <= np.array(tolerance, dtype=np.int16), axis=-1)
 
-    if shift_axis == 'x':
-        # shift columns: move bgr_1 mask right by 1 pixel
-        if shift < W:
-            border_shifted[:, shift:] = mask_bgr_1[:, :-shift]
-    elif shift_axis == 'y':
-        # shift rows: move bgr_1 mask down by 1 pixel
-        if shift < H:
-            border_shifted[shift:, :] = mask_bgr_1[:-shift, :]
-    else:
-        raise ValueError(f"Invalid shift_axis: {shift_axis}")
 
-    hits = cv2.bitwise_and(mask_bgr_2, border_shifted)
-    bin_mask = (hits > 0).astype(np.int32)
+def _find_adjacent_colors_pyramid(img, det, coarse_border, step, cache=None, region=None, context=None):
+    """
+    Coarse-to-fine search for a horizontal adjacent color pair (shift_axis 'x').
+    The coarse stage checks every `step`-th row only. Since step <= run_length, every valid run
+    crosses at least one coarse row, so each true hit has a candidate in its column. Candidates are
+    then confirmed at full resolution by reading only the few pixels around them.
+    Args:
+        img (np.ndarray): BGR image to search.
+        det (dict): detector definition, see CHAMPION_DETECTORS.
+        coarse_border (np.ndarray): shifted bgr_1 mask of img[::step].
+        step (int): coarse row step.
+        cache (dict, optional): per-frame mask cache.
+        region (tuple, optional): region `img` was sliced from, used as part of the cache key.
+        context (DetectorContext, optional): provides the coarse mask buffers.
+    Returns:
+        np.ndarray: same (x, y) locations, in the same order, as `_find_adjacent_colors`.
+    """
+    H, W = img.shape[:2]
+    run_length = det["run_length"]
+    if run_length > H:
+        return _NO_LOCATIONS
 
-    # For vertical adjacency (shift_axis == 'y') transpose so run detection logic stays the same
-    proc = bin_mask if shift_axis == "x" else bin_mask.T
-    Hp, Wp = proc.shape
-    if run_length > Hp:
-        return []
+    if cache is None:
+        cache = {}
+    mask_bgr_2 = _get_mask(img[::step], det["bgr_2"], det["bgr_2_tolerance"], cache, (region, step), context)
+    dst = None if context is None else context.buffer(("hits", region, step), coarse_border.shape)
+    cand_rows, cand_xs = np.nonzero(cv2.bitwise_and(mask_bgr_2, coarse_border, dst=dst))
+    if cand_xs.size == 0:
+        return _NO_LOCATIONS
 
-    csum = np.vstack([np.zeros((1, Wp), dtype=np.int32), proc.cumsum(axis=0, dtype=np.int32)])
-    runs = csum[run_length:] - csum[:-run_length]
+    # Window of rows around each candidate that any run through it can start from or reach
+    window = np.arange(-(run_length - 1), run_length)
+    rows = cand_rows[:, None] * step + window[None, :]
+    valid = (rows >= 0) & (rows < H)
+    rows = np.clip(rows, 0, H - 1)
+    xs = cand_xs[:, None]
 
-    ys, xs = np.where(runs == run_length)
-    for y, x in zip(ys, xs):
-        if shift_axis == 'x':
-            found_locations.append((int(x), int(y)))
-        elif shift_axis == 'y':
-            # proc is transposed: original x = y, original y = x
-            found_locations.append((int(y), int(x)))
+    pair = (
+        _match_color(img[rows, xs], det["bgr_2"], det["bgr_2_tolerance"])
+        & _match_color(img[rows, xs - 1], det["bgr_1"], det["bgr_1_tolerance"])
+        & valid
+    )
 
-    if not found_locations:
-        return []
+    # A run starting at window offset j covers offsets j .. j + run_length - 1
+    found_x = []
+    found_y = []
+    for j in range(run_length):
+        ok = pair[:, j:j + run_length].all(axis=1)
+        found_x.append(cand_xs[ok])
+        found_y.append(rows[ok, j])
+    found_x = np.concatenate(found_x)
+    found_y = np.concatenate(found_y)
+    if found_x.size == 0:
+        return _NO_LOCATIONS
 
-    # De-duplicate while preserving order
-    uniq = list(dict.fromkeys(found_locations))
-    return uniq
+    # De-duplicate and order row-major like the full scan
+    keys = np.unique(found_y.astype(np.int64) * W + found_x)
+    locations = np.empty((keys.size, 2), dtype=np.int32)
+    locations[:, 0] = keys % W
+    locations[:, 1] = keys // W
+    return locations
 
 
-def find_ally_locations(img):
+def find_adjacent_color_groups(img, detectors=CHAMPION_DETECTORS, cache=None, region=None, search="full", context=None, workers=None):
     """
-    Finds the location of an ally champion by using ally health bar and border colors.
+    Runs several adjacent color detectors over one frame in a single pass.
+    Detectors that share bgr_1, bgr_1_tolerance and shift_axis reuse one border mask and
+    one shifted buffer instead of rebuilding them per detector.
     Args:
         img (np.ndarray): BGR image to search.
+        detectors (dict): name -> detector definition, see CHAMPION_DETECTORS.
+        cache (dict, optional): per-frame cache of masks. Pass the same dict for the same frame
+            to share masks across calls.
+        region (tuple, optional): (x0, y0, x1, y1) slice of `img` to search. The slice is a view,
+            and returned locations are still in full image coordinates.
+        search (str): 'full' to scan every pixel, 'pyramid' to find candidates on every
+            run_length-th row first and confirm them at full resolution. Only detectors with
+            shift_axis 'x' and run_length > 1 use the pyramid; the others always scan fully.
+        context (DetectorContext, optional): reuses preallocated buffers instead of allocating
+            new frame-sized arrays on every call. Ignored when the search runs on several workers.
+        workers (int, optional): threads to split the search across, see _find_adjacent_color_groups_banded.
+            Defaults to `General.detection_workers`.
     Returns:
-        list of (x,y) coordinates
+        dict: name -> (N, 2) int32 array of (x, y) locations with the detector offset applied (may be empty),
+            see to_location_list.
     """
-    locations = _find_adjacent_colors(img, HEALTH_LEFT_COLOR, ALLY_HEALTH_RIGHT_COLOR, bgr_1_tolerance=3, bgr_2_tolerance=3, run_length=4, shift_axis='x')
-    if not locations:
-        return []
-    return [(x + 50, y + 160) for (x, y) in locations]
+    if cache is None:
+        cache = {}
+    if workers is None:
+        workers = _detection_workers
+    if workers > 1:
+        bands = _split_bands(img.shape, region, workers)
+        if len(bands) > 1:
+            return _find_adjacent_color_groups_banded(img, detectors, cache, bands, search, workers)
+    if context is not None:
+        context.prepare(img.shape)
 
-def find_enemy_locations(img):
+    x0, y0 = 0, 0
+    if region is not None:
+        x0, y0, x1, y1 = region
+        img = img[y0:y1, x0:x1]
+
+    results = {}
+    for name, det in detectors.items():
+        step = 1
+        if search == "pyramid" and det["shift_axis"] == "x" and det["run_length"] > 1:
+            step = det["run_length"]
+
+        border_key = ("border", tuple(det["bgr_1"]), det["bgr_1_tolerance"], det["shift_axis"], region, step)
+        border_shifted = cache.get(border_key)
+        if border_shifted is None:
+            mask_bgr_1 = _get_mask(img[::step], det["bgr_1"], det["bgr_1_tolerance"], cache, (region, step), context)
+            out = None if context is None else context.buffer(border_key, mask_bgr_1.shape)
+            border_shifted = _shift_mask(mask_bgr_1, det["shift_axis"], out)
+            cache[border_key] = border_shifted
+
+        if step > 1:
+            locations = _find_adjacent_colors_pyramid(img, det, border_shifted, step, cache, region, context)
+        else:
+            mask_bgr_2 = _get_mask(img, det["bgr_2"], det["bgr_2_tolerance"], cache, (region, step), context)
+            dst = None if context is None else context.buffer(("hits", region, step), mask_bgr_2.shape)
+            hits = cv2.bitwise_and(mask_bgr_2, border_shifted, dst=dst)
+            locations = _find_runs(hits, det["run_length"], det["shift_axis"], context)
+
+        dx, dy = det["offset"]
+        results[name] = _offset_locations(locations, x0 + dx, y0 + dy)
+    return results
+
+
+# ===========================
+# Band-parallel Detection
+# ===========================
+
+# Threads used to search horizontal bands of a frame in parallel, 1 disables it
+_detection_workers = max(1, int(_general.get("detection_workers", 1)))
+
+# Bands shorter than this are not worth the thread hand-off
+_MIN_BAND_ROWS = 64
+
+_detection_pool = None
+_detection_pool_workers = 0
+
+
+def _get_detection_pool(workers):
     """
-    Finds the location of an enemy champion by using enemy health bar and border colors.
+    Returns the shared detection thread pool, recreating it when the worker count changes.
+    """
+    global _detection_pool, _detection_pool_workers
+    if _detection_pool is None or _detection_pool_workers != workers:
+        if _detection_pool is not None:
+            _detection_pool.shutdown(wait=False)
+        _detection_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detection")
+        _detection_pool_workers = workers
+    return _detection_pool
+
+
+def _split_bands(shape, region, workers):
+    """
+    Splits the searched rows into up to `workers` horizontal bands of at least _MIN_BAND_ROWS rows.
     Args:
-        img (np.ndarray): BGR image to search.
+        shape (tuple): image shape.
+        region (tuple | None): (x0, y0, x1, y1) searched region, None for the whole image.
+        workers (int): number of threads.
     Returns:
-        list of (x,y) coordinates
+        list[tuple]: (x0, y0, x1, y1) band regions without overlap, covering the searched region.
     """
-    locations = _find_adjacent_colors(img, HEALTH_LEFT_COLOR, ENEMY_HEALTH_RIGHT_COLOR, bgr_1_tolerance=3, bgr_2_tolerance=3, run_length=4, shift_axis='x')
-    if not locations:
-        return []
-    return [(x + 50, y + 160) for (x, y) in locations]
+    if region is None:
+        region = (0, 0, shape[1], shape[0])
+    x0, y0, x1, y1 = region
+    count = max(1, min(workers, (y1 - y0) // _MIN_BAND_ROWS))
+    edges = np.linspace(y0, y1, count + 1).astype(int)
+    return [(x0, int(edges[i]), x1, int(edges[i + 1])) for i in range(count)]
 
 
-def find_player_location(img):
+def _find_adjacent_color_groups_banded(img, detectors, cache, bands, search, workers):
     """
-    Finds the location of the player champion by using enemy health bar and border colors.
+    Band-parallel `find_adjacent_color_groups`. OpenCV and NumPy release the GIL, so the mask,
+    shift and run-detection steps of each band run concurrently on the detection thread pool.
+    Each band is searched with enough extra rows to see the whole pattern: one row above for
+    vertically adjacent pairs and `run_length - 1` rows below for vertical runs. Only hits that
+    start inside the band itself are kept, so merging the bands in order gives the same locations
+    as one full search.
     Args:
         img (np.ndarray): BGR image to search.
+        detectors (dict): name -> detector definition, see CHAMPION_DETECTORS.
+        cache (dict): per-frame mask cache, keyed by band.
+        bands (list[tuple]): band regions from _split_bands.
+        search (str): see find_adjacent_color_groups.
+        workers (int): number of threads.
     Returns:
-        list of (x,y) coordinates
+        dict: name -> (N, 2) int32 array of (x, y) locations with the detector offset applied (may be empty).
     """
-    locations = _find_adjacent_colors(img, HEALTH_LEFT_COLOR, PLAYER_HEALTH_RIGHT_COLOR, bgr_1_tolerance=3, bgr_2_tolerance=3, run_length=4, shift_axis='x')
-    if not locations:
-        return []
-    first_location = locations[0]
-    return (first_location[0] + 50, first_location[1] + 160)
+    H = img.shape[0]
+    below = max(det["run_length"] for det in detectors.values()) - 1
+    above = 1 if any(det["shift_axis"] == "y" for det in detectors.values()) else 0
 
+    def search_band(band):
+        x0, y0, x1, y1 = band
+        padded = (x0, max(y0 - above, 0), x1, min(y1 + below, H))
+        found = find_adjacent_color_groups(img, detectors, cache, padded, search, workers=1)
+        kept = {}
+        for name, locations in found.items():
+            y = locations[:, 1] - detectors[name]["offset"][1]
+            kept[name] = locations[(y >= y0) & (y < y1)]
+        return kept
 
-def find_attached_ally_location(img):
+    band_results = list(_get_detection_pool(workers).map(search_band, bands))
+    results = {}
+    for name, det in detectors.items():
+        merged = np.concatenate([band_result[name] for band_result in band_results])
+        if det["shift_axis"] == "y":
+            # Vertical-pair searches report column by column, bands are split by row
+            merged = merged[np.lexsort((merged[:, 1], merged[:, 0]))]
+        results[name] = merged
+    return results
+
+
+# ===========================
+# First-hit Search
+# ===========================
+
+
+# Detectors whose find_* functions only report their first location
+SINGLE_RESULT_DETECTORS = ("player", "attached_ally", "augment", "shop", "arena_exit")
+
+# 'full' finds every hit and keeps the first, 'first_hit' stops at the first hit, see find_first_adjacent_color
+_single_result_search = _general.get("single_result_search", "first_hit")
+
+
+def find_first_adjacent_color(img, det, region=None, search="full", band_size=FIRST_HIT_BAND_SIZE, cache=None, context=None):
     """
-    Finds the location of an enemy champion by using enemy health bar and border colors.
+    Finds the first location `find_adjacent_color_groups` would report for a detector, without searching
+    past it. Hits are reported row by row for horizontally adjacent pairs and column by column for
+    vertically adjacent pairs, so the search runs over bands of rows or columns in that same order and
+    stops at the first band with a hit. Each band is searched with `run_length - 1` extra rows or
+    columns, so runs crossing into the next band are still seen.
+    Band masks are stored in `cache` under the band's region, so detectors sharing a border color
+    (e.g. player and attached_ally) build each band's border mask once per frame.
     Args:
         img (np.ndarray): BGR image to search.
+        det (dict): detector definition, see CHAMPION_DETECTORS.
+        region (tuple, optional): (x0, y0, x1, y1) slice of `img` to search, e.g. a UI region of interest.
+        search (str): see find_adjacent_color_groups.
+        band_size (int): rows or columns per band.
+        cache (dict, optional): per-frame mask cache, see find_adjacent_color_groups.
+        context (DetectorContext, optional): preallocated buffers. Band regions are the same every
+            frame, so their buffers are reused.
     Returns:
-        list of (x,y) coordinates
+        tuple | None: (x, y) location with the detector offset applied, or None if there is no hit.
     """
-    locations = _find_adjacent_colors(img, ATTACHED_ALLY_LEFT_COLOR, ATTACHED_ALLY_RIGHT_COLOR, bgr_1_tolerance=3, bgr_2_tolerance=3, run_length=4, shift_axis='x')
-    if not locations:
-        return []
-    first_location = locations[0]
-    return (first_location[0] + 50, first_location[1] + 160)
+    if cache is None:
+        cache = {}
+    H, W = img.shape[:2]
+    x0, y0, x1, y1 = region if region is not None else (0, 0, W, H)
+    extra = det["run_length"] - 1
+    dx, dy = det["offset"]
+    detectors = {"first": det}
+    rows = det["shift_axis"] == "x"
+    start, stop = (y0, y1) if rows else (x0, x1)
 
+    for band_start in range(start, stop, band_size):
+        band_end = min(band_start + band_size, stop)
+        if rows:
+            band = (x0, band_start, x1, min(band_end + extra, stop))
+        else:
+            band = (band_start, y0, min(band_end + extra, stop), y1)
+        hits = find_adjacent_color_groups(img, detectors, cache, band, search, context, workers=1)["first"]
+        if len(hits) == 0:
+            continue
+        x, y = hits[0].tolist()
+        # Hits starting in the extra rows or columns belong to the next band
+        if (y - dy if rows else x - dx) < band_end:
+            return (x, y)
+    return None
 
-def find_augment_location(img):
+
+# ===========================
+# Region Change Tracking
+# ===========================
+
+
+class RegionChangeTracker:
     """
-    Finds the location of the augment by using hide augment button's inner and border colors.
-    Returns:
-        list of (x,y) coordinates
+    Remembers detector results together with a cheap fingerprint of the region they searched.
+    A detector whose region has not changed since its last run returns its cached result instead
+    of scanning the same pixels again, e.g. while the shop or a death timer is on screen.
+    Not thread-safe: use one tracker per thread.
     """
-    locations = _find_adjacent_colors(img, AUGMENT_UPPER_COLOR, AUGMENT_LOWER_COLOR, bgr_1_tolerance=3, bgr_2_tolerance=3, run_length=1, shift_axis='y')
-    if not locations:
-        return []
-    first_location = locations[0]
-    return (first_location[0], first_location[1] - 400)
 
+    def __init__(self, band_height=REGION_FINGERPRINT_BAND_HEIGHT):
+        """
+        Initialize the RegionChangeTracker.
 
-def find_shop_location(img):
+        Args:
+            band_height (int): rows per fingerprint band, see REGION_FINGERPRINT_BAND_HEIGHT.
+        """
+        self.band_height = band_height
+        self._entries = {}
+        # Fingerprint shape -> scratch buffer the next fingerprint is computed into
+        self._scratch = {}
+        self.skipped = 0
+        self.computed = 0
+
+
+    def _shape(self, img, region):
+        """
+        Returns the (bands, width * 3) shape of the fingerprint of a region.
+        """
+        if region is not None:
+            x0, y0, x1, y1 = region
+            img = img[y0:y1, x0:x1]
+        H, W = img.shape[:2]
+        if H == 0 or W == 0:
+            return (0, 0)
+        return (-(-H // self.band_height), W * int(np.prod(img.shape[2:], dtype=np.int64)))
+
+
+    def fingerprint(self, img, region=None, out=None):
+        """
+        Returns the per-band column checksums of a region.
+        The region is read through a strided view, so it is never copied.
+        Args:
+            img (np.ndarray): BGR image.
+            region (tuple, optional): (x0, y0, x1, y1) slice of `img`. Uses the whole image by default.
+            out (np.ndarray, optional): int32 array of the fingerprint's shape to write the checksums into.
+        Returns:
+            np.ndarray: (bands, width * 3) int32 column sums.
+        """
+        shape = self._shape(img, region)
+        if out is None:
+            out = np.empty(shape, dtype=np.int32)
+        elif out.shape != shape:
+            raise ValueError(f"Fingerprint buffer has shape {out.shape}, expected {shape}")
+        if out.size == 0:
+            return out
+        if region is not None:
+            x0, y0, x1, y1 = region
+            img = img[y0:y1, x0:x1]
+        # Pixels of a row slice are contiguous, so rows flatten to a view with the frame's row stride
+        flat = img.reshape(img.shape[0], -1)
+        for i, y in enumerate(range(0, flat.shape[0], self.band_height)):
+            cv2.reduce(flat[y:y + self.band_height], 0, cv2.REDUCE_SUM, dst=out[i:i + 1], dtype=cv2.CV_32S)
+        return out
+
+
+    def get_or_run(self, key, img, region, run):
+        """
+        Returns the cached result of `key` if `region` of `img` is unchanged since it was stored,
+        otherwise calls `run` and caches its result.
+        Fingerprints are computed into a scratch buffer and only copied into the entry when they
+        changed, so lookups of unchanged regions allocate nothing.
+        Args:
+            key (hashable): detector name.
+            img (np.ndarray): BGR image the detector searches.
+            region (tuple | None): (x0, y0, x1, y1) region the detector reads, None for the whole image.
+            run (callable): runs the detector and returns its result.
+        Returns:
+            list: the detector result.
+        """
+        shape = self._shape(img, region)
+        scratch = self._scratch.get(shape)
+        if scratch is None:
+            scratch = self._scratch[shape] = np.empty(shape, dtype=np.int32)
+        fingerprint = self.fingerprint(img, region, scratch)
+        entry = self._entries.get((key, region))
+        # cv2.norm compares without the boolean temporary of np.array_equal
+        unchanged = entry is not None and entry[0].shape == shape and (
+            fingerprint.size == 0 or cv2.norm(entry[0], fingerprint, cv2.NORM_INF) == 0
+        )
+        if unchanged:
+            self.skipped += 1
+            return list(entry[1])
+
+        result = run()
+        if entry is not None and entry[0].shape == shape:
+            np.copyto(entry[0], fingerprint)
+            stored = entry[0]
+        else:
+            stored = fingerprint.copy()
+        self._entries[(key, region)] = (stored, list(result))
+        self.computed += 1
+        return result
+
+
+    def get_stats(self):
+        """
+        Returns how often detections were skipped because their region was unchanged.
+        Returns:
+            dict: skipped, computed and the skipped fraction of all lookups.
+        """
+        total = self.skipped + self.computed
+        return {
+            "skipped": self.skipped,
+            "computed": self.computed,
+            "skip_ratio": self.skipped / total if total else 0.0,
+        }
+
+
+    def clear(self):
+        """
+        Drops every cached result, forcing the next lookups to run their detectors.
+        """
+        self._entries.clear()
+
+
+# ===========================
+# UI Region of Interest
+# ===========================
+
+
+def _scale_ui_region(region):
     """
-    Finds the location of the shop by using hide shop button's inner and border colors.
+    Scales a UI region from UI_REFERENCE_RESOLUTION to screen pixels.
+    The game is assumed to render at `General.game_resolution`, centered on the screen.
+    Args:
+        region (tuple): (x0, y0, x1, y1) in reference pixels.
     Returns:
-        list of (x,y) coordinates
+        tuple | None: (x0, y0, x1, y1) in screen pixels, or None if the region is empty.
     """
-    locations = _find_adjacent_colors(img, SHOP_UPPER_COLOR, SHOP_LOWER_COLOR, bgr_1_tolerance=2, bgr_2_tolerance=5, run_length=1, shift_axis='y')
-    if not locations:
-        return []
-    first_location = locations[0]
-    return (first_location[0], first_location[1])
+    game_res = _general.get("game_resolution", {})
+    game_w = int(game_res.get("width", SCREEN_WIDTH))
+    game_h = int(game_res.get("height", SCREEN_HEIGHT))
+    ref_w, ref_h = UI_REFERENCE_RESOLUTION
+    scale_x = game_w / ref_w
+    scale_y = game_h / ref_h
+    origin_x = max(0, (SCREEN_WIDTH - game_w) // 2)
+    origin_y = max(0, (SCREEN_HEIGHT - game_h) // 2)
 
+    x0 = max(0, min(SCREEN_WIDTH, origin_x + int(region[0] * scale_x)))
+    y0 = max(0, min(SCREEN_HEIGHT, origin_y + int(region[1] * scale_y)))
+    x1 = max(0, min(SCREEN_WIDTH, origin_x + int(round(region[2] * scale_x))))
+    y1 = max(0, min(SCREEN_HEIGHT, origin_y + int(round(region[3] * scale_y))))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1, y1)
 
-def find_arena_exit_location(img):
+
+_ui_regions = {name: _scale_ui_region(det["region"]) for name, det in UI_DETECTORS.items() if det.get("region")}
+_ui_roi_miss_streak = int(_general.get("ui_roi_miss_streak", UI_ROI_MISS_STREAK))
+
+
+def _run_ui_detector(img, name, region, cache, context, changes, method, first=False):
     """
-    Finds the location of the shop by using hide shop button's inner and border colors.
+    Runs a UI detector over `region`, skipping it if `changes` reports the region as unchanged.
+    """
+    def run():
+        if method == "template":
+            return find_ui_template_locations(img, name, region)
+        if first:
+            location = find_first_adjacent_color(img, UI_DETECTORS[name], region, cache=cache, context=context)
+            return [location] if location is not None else []
+        return to_location_list(find_adjacent_color_groups(img, {name: UI_DETECTORS[name]}, cache, region, context=context)[name])
+
+    if changes is None:
+        return run()
+    return changes.get_or_run((name, method, first), img, region, run)
+
+
+def _in_region(locations, region):
+    """
+    Returns True if any of `locations` lies inside `region` (x0, y0, x1, y1).
+    """
+    x0, y0, x1, y1 = region
+    return any(x0 <= x < x1 and y0 <= y < y1 for x, y in locations)
+
+
+def find_ui_locations(img, name, cache=None, context=None, changes=None, method=None, first=False):
+    """
+    Runs a UI detector inside its region of interest.
+    With a `context`, falls back to full-screen scans once the detector has missed `ui_roi_miss_streak`
+    times in a row, and keeps scanning the full screen while its hits land outside the region.
+    Without a `context` there is no miss streak, so only the region is searched.
+    Images that are not full-screen captures are always searched completely.
+    Args:
+        img (np.ndarray): BGR screen capture to search.
+        name (str): UI_DETECTORS name, e.g. "shop".
+        cache (dict, optional): per-frame mask cache, see find_adjacent_color_groups.
+        context (DetectorContext, optional): preallocated buffers and miss streaks, see DetectorContext.
+        changes (RegionChangeTracker, optional): returns the previous result while the searched
+            region is unchanged.
+        method (str, optional): 'color' for the color pair or 'template' for template matching.
+            Defaults to `General.ui_detection[name]`. Elements without a template use 'color'.
+        first (bool): stop at the first hit, see find_first_adjacent_color. Returns at most one location.
     Returns:
-        list of (x,y) coordinates
+        list of (x,y) coordinates, in screen pixels for captured frames, see configure_capture
     """
-    locations = _find_adjacent_colors(img, ARENA_EXIT_UPPER_COLOR, ARENA_EXIT_LOWER_COLOR, bgr_1_tolerance=1, bgr_2_tolerance=0, run_length=1, shift_axis='y')
+    if method is None:
+        method = _ui_detection.get(name, "color")
+    if method == "template" and name not in UI_TEMPLATES:
+        method = "color"
+    region = _ui_regions.get(name)
+    if region is not None:
+        # Captured frames are searched in the part of the region they cover
+        region = _capture_transform.region_to_frame(region) if _capture_transform.is_capture(img) else None
+
+    streaks = context.ui_miss_streaks if context is not None else None
+    streak = streaks.get(name, 0) if streaks is not None else 0
+    if region is None:
+        locations = _run_ui_detector(img, name, None, cache, context, changes, method, first)
+    elif streak < _ui_roi_miss_streak:
+        locations = _run_ui_detector(img, name, region, cache, context, changes, method, first)
+        if streaks is not None:
+            streaks[name] = 0 if locations else streak + 1
+    else:
+        locations = _run_ui_detector(img, name, None, cache, context, changes, method, first)
+        if locations and not _in_region(locations, region):
+            # Stay on full scans until the element is back inside its region
+            logging.debug("UI detector '%s' found outside its region at %s", name, locations[0])
+        else:
+            streaks[name] = 0
+
+    transform = _capture_of(img)
+    return locations if transform is None else transform.locations_to_screen(locations)
+
+
+# ===========================
+# Capture Region
+# ===========================
+
+
+class CaptureTransform(namedtuple("CaptureTransform", ["x0", "y0", "x1", "y1", "scale"])):
+    """
+    Maps between the pixels of captured frames and screen pixels. Frames are captured from the
+    screen region (x0, y0, x1, y1) and resized by `scale`, so screen = (x0, y0) + frame / scale.
+    """
+    __slots__ = ()
+
+    @property
+    def frame_shape(self):
+        """(height, width) of the captured frames."""
+        return (int(round((self.y1 - self.y0) * self.scale)), int(round((self.x1 - self.x0) * self.scale)))
+
+    @property
+    def is_identity(self):
+        """Whether captured frames are full-resolution screen captures."""
+        return (self.x0, self.y0, self.x1, self.y1, self.scale) == (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT, 1)
+
+    def is_capture(self, img):
+        """Whether `img` has the shape of a captured frame."""
+        return img.shape[:2] == self.frame_shape
+
+    def to_screen(self, location):
+        """Maps an (x, y) frame location to screen pixels."""
+        x, y = location
+        return (self.x0 + int(round(x / self.scale)), self.y0 + int(round(y / self.scale)))
+
+    def to_frame(self, location):
+        """Maps an (x, y) screen location to frame pixels."""
+        x, y = location
+        return (int(round((x - self.x0) * self.scale)), int(round((y - self.y0) * self.scale)))
+
+    def locations_to_screen(self, locations):
+        """Maps a list of (x, y) frame locations to screen pixels."""
+        if self.is_identity:
+            return locations
+        return [self.to_screen(location) for location in locations]
+
+    def detection_to_screen(self, detection):
+        """Returns a copy of a detection dict with its location, centroid, bbox and velocity in screen pixels."""
+        if self.is_identity:
+            return detection
+        mapped = dict(detection)
+        for key in ("location", "centroid"):
+            if key in mapped:
+                mapped[key] = self.to_screen(mapped[key])
+        if "bbox" in mapped:
+            x0, y0, x1, y1 = mapped["bbox"]
+            mapped["bbox"] = self.to_screen((x0, y0)) + self.to_screen((x1, y1))
+        if "velocity" in mapped:
+            vx, vy = mapped["velocity"]
+            mapped["velocity"] = (vx / self.scale, vy / self.scale)
+        return mapped
+
+    def region_to_frame(self, region):
+        """
+        Maps an (x0, y0, x1, y1) screen region to the frame pixels covering it, clipped to the frame.
+        Returns None if the region is outside the captured region.
+        """
+        H, W = self.frame_shape
+        x0 = max(0, int(np.floor((region[0] - self.x0) * self.scale)))
+        y0 = max(0, int(np.floor((region[1] - self.y0) * self.scale)))
+        x1 = min(W, int(np.ceil((region[2] - self.x0) * self.scale)))
+        y1 = min(H, int(np.ceil((region[3] - self.y0) * self.scale)))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1, y1)
+
+
+def get_capture_region(region="screen"):
+    """
+    Resolves a capture region setting to screen pixels.
+    Args:
+        region (str | list): 'screen', 'game_window' for the game rendered at `General.game_resolution`
+            centered on the screen, an (x0, y0, x1, y1) rect, or a list of rects, e.g. HUD regions.
+            A list is captured as one rect covering all of them.
+    Returns:
+        tuple: (x0, y0, x1, y1) clipped to the screen.
+    """
+    if region in (None, "screen"):
+        return (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+    if region == "game_window":
+        return _scale_ui_region((0, 0) + tuple(UI_REFERENCE_RESOLUTION))
+    rects = [region] if np.ndim(region) == 1 else list(region)
+    x0 = max(0, min(int(r[0]) for r in rects))
+    y0 = max(0, min(int(r[1]) for r in rects))
+    x1 = min(SCREEN_WIDTH, max(int(r[2]) for r in rects))
+    y1 = min(SCREEN_HEIGHT, max(int(r[3]) for r in rects))
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"Empty capture region: {region}")
+    return (x0, y0, x1, y1)
+
+
+def _create_capture_transform(settings):
+    """
+    Returns the CaptureTransform of a `General.capture` setting.
+    """
+    scale = float(settings.get("scale", 1.0))
+    if not 0 < scale <= 1:
+        raise ValueError(f"Capture scale must be in (0, 1], got {scale}")
+    return CaptureTransform(*get_capture_region(settings.get("region", "screen")), scale)
+
+
+# Region and downscale of captured frames, see configure_capture
+_capture_transform = _create_capture_transform(_general.get("capture", {}))
+
+
+def get_capture_transform():
+    """
+    Returns the CaptureTransform of the configured `General.capture` region and scale.
+    """
+    return _capture_transform
+
+
+def configure_capture(region="screen", scale=1.0):
+    """
+    Changes the captured region and downscale at runtime. Frames with the shape of a captured frame
+    are then searched in the matching UI regions, and the find_* functions report their locations
+    in screen pixels. Downscaled frames suit the minimap, scene classifier and template matching;
+    the color-pair detectors match 1 px borders and run lengths of full-resolution frames.
+    Args:
+        region (str | list): see get_capture_region.
+        scale (float): resize factor in (0, 1] applied to captured frames.
+    Returns:
+        dict: the previous settings, to restore them with `configure_capture(**previous)`.
+    """
+    global _capture_transform
+    previous = _capture_transform
+    _capture_transform = _create_capture_transform({"region": region, "scale": scale})
+    _scene_cells.clear()
+    return {"region": list(previous[:4]), "scale": previous.scale}
+
+
+def _capture_of(img):
+    """
+    Returns the capture transform if `img` is a captured frame that is not a plain screen capture, else None.
+    """
+    if _capture_transform.is_identity or not _capture_transform.is_capture(img):
+        return None
+    return _capture_transform
+
+
+# ===========================
+# UI Templates
+# ===========================
+
+
+# UI detection method per element, 'color' or 'template', see find_ui_locations
+_ui_detection = _general.get("ui_detection", {})
+
+
+class TemplateMatcher:
+    """
+    Coarse-to-fine template matcher for a single UI element.
+    The region is first searched downscaled; a weak best score ends the search early,
+    otherwise the best candidate is refined at full resolution in a small window.
+    """
+
+    def __init__(self, template, anchor=(0, 0), offset=(0, 0), threshold=0.85, pyramid_scale=UI_TEMPLATE_PYRAMID_SCALE):
+        """
+        Initialize the TemplateMatcher.
+
+        Args:
+            template (np.ndarray): BGR template at the scale it appears on screen.
+            anchor (tuple): (x, y) point inside the template that is reported for a match.
+            offset (tuple): (x, y) added to the reported point, see UI_DETECTORS.
+            threshold (float): minimum TM_CCOEFF_NORMED score of a match.
+            pyramid_scale (float): downscale factor of the coarse search, 1 disables it.
+        """
+        self.template = template
+        self.anchor = anchor
+        self.offset = offset
+        self.threshold = threshold
+        self.pyramid_scale = pyramid_scale
+        self._coarse = None
+        th, tw = template.shape[:2]
+        if pyramid_scale < 1 and min(th, tw) * pyramid_scale >= 8:
+            self._coarse = cv2.resize(template, None, fx=pyramid_scale, fy=pyramid_scale, interpolation=cv2.INTER_AREA)
+
+
+    def match(self, img, region=None):
+        """
+        Finds the best match of the template.
+        Args:
+            img (np.ndarray): BGR image to search.
+            region (tuple, optional): (x0, y0, x1, y1) slice of `img` to search.
+        Returns:
+            tuple: ((x, y) reported point or None, best score)
+        """
+        x0, y0 = 0, 0
+        roi = img
+        if region is not None:
+            x0, y0, x1, y1 = region
+            roi = img[y0:y1, x0:x1]
+        H, W = roi.shape[:2]
+        th, tw = self.template.shape[:2]
+        if H < th or W < tw:
+            return None, 0.0
+
+        wx0, wy0, window = 0, 0, roi
+        if self._coarse is not None:
+            s = self.pyramid_scale
+            small = cv2.resize(roi, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+            if small.shape[0] >= self._coarse.shape[0] and small.shape[1] >= self._coarse.shape[1]:
+                _, best, _, (cx, cy) = cv2.minMaxLoc(cv2.matchTemplate(small, self._coarse, cv2.TM_CCOEFF_NORMED))
+                # Downscaling only blurs a real match slightly, so a weak coarse score means it is not there
+                if best < self.threshold - UI_TEMPLATE_COARSE_MARGIN:
+                    return None, best
+                pad = int(np.ceil(1 / s)) + 1
+                fx, fy = int(round(cx / s)), int(round(cy / s))
+                wx0, wy0 = max(fx - pad, 0), max(fy - pad, 0)
+                window = roi[wy0:min(fy + pad + th, H), wx0:min(fx + pad + tw, W)]
+
+        _, best, _, (mx, my) = cv2.minMaxLoc(cv2.matchTemplate(window, self.template, cv2.TM_CCOEFF_NORMED))
+        if best < self.threshold:
+            return None, best
+        ax, ay = self.anchor
+        dx, dy = self.offset
+        return (x0 + wx0 + mx + ax + dx, y0 + wy0 + my + ay + dy), best
+
+
+_ui_templates = {}
+
+
+def _template_scale(img):
+    """
+    Returns the scale of UI elements in `img` relative to UI_REFERENCE_RESOLUTION.
+    Captured frames use the configured game resolution and capture scale, other frames with the reference aspect
+    ratio their own height. Anything else is a crop and assumed to be at reference scale.
+    """
+    H, W = img.shape[:2]
+    ref_w, ref_h = UI_REFERENCE_RESOLUTION
+    if _capture_transform.is_capture(img):
+        game_h = int(_general.get("game_resolution", {}).get("height", SCREEN_HEIGHT)) * _capture_transform.scale
+    elif W * ref_h == H * ref_w:
+        game_h = H
+    else:
+        game_h = ref_h
+    return round(game_h / ref_h, 4)
+
+
+def get_ui_template(name, scale=1.0):
+    """
+    Returns the TemplateMatcher of a UI element at a given scale. Templates are loaded from assets/
+    and scaled once per scale, then reused.
+    Args:
+        name (str): UI_TEMPLATES name, e.g. "augment".
+        scale (float): size relative to UI_REFERENCE_RESOLUTION.
+    Returns:
+        TemplateMatcher | None: None if the element has no template or it failed to load.
+    """
+    key = (name, scale)
+    if key in _ui_templates:
+        return _ui_templates[key]
+
+    matcher = None
+    spec = UI_TEMPLATES.get(name)
+    if spec is not None:
+        template = cv2.imread(os.path.join(ASSETS_DIR, spec["path"]))
+        if template is None:
+            logging.warning("UI template '%s' could not be loaded from %s", name, spec["path"])
+        else:
+            if scale != 1.0:
+                interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+                template = cv2.resize(template, None, fx=scale, fy=scale, interpolation=interpolation)
+            # Report the same point as the color pair: its first hit inside the template
+            det = UI_DETECTORS[name]
+            hits = _find_adjacent_colors(
+                template, det["bgr_1"], det["bgr_2"], det["bgr_1_tolerance"], det["bgr_2_tolerance"],
+                det["run_length"], det["shift_axis"],
+            )
+            anchor = tuple(hits[0].tolist()) if len(hits) else (template.shape[1] // 2, template.shape[0] // 2)
+            matcher = TemplateMatcher(template, anchor, det["offset"], spec["threshold"])
+    _ui_templates[key] = matcher
+    return matcher
+
+
+def find_ui_template_locations(img, name, region=None):
+    """
+    Finds a UI element by matching its reference template.
+    Args:
+        img (np.ndarray): BGR image to search.
+        name (str): UI_TEMPLATES name, e.g. "augment".
+        region (tuple, optional): (x0, y0, x1, y1) slice of `img` to search.
+    Returns:
+        list of (x,y) coordinates, with at most one entry
+    """
+    matcher = get_ui_template(name, _template_scale(img))
+    if matcher is None:
+        return []
+    location, _ = matcher.match(img, region)
+    return [location] if location is not None else []
+
+
+# Preload the templates of elements configured for template matching
+for _name, _method in _ui_detection.items():
+    if _method == "template" and _name not in UI_TEMPLATES:
+        logging.warning("UI element '%s' has no reference template, using color detection", _name)
+    elif _method == "template":
+        get_ui_template(_name, round(int(_general.get("game_resolution", {}).get("height", SCREEN_HEIGHT)) / UI_REFERENCE_RESOLUTION[1], 4))
+
+
+# Health bar search mode, see find_adjacent_color_groups
+_health_bar_search = _general.get("health_bar_search", "full")
+
+
+def cluster_locations(locations, max_gap=HEALTH_BAR_CLUSTER_GAP):
+    """
+    Groups raw hits that belong to the same object, e.g. the rows of one health bar.
+    Hits within about `max_gap` pixels of each other are joined into one cluster.
+    Args:
+        locations (np.ndarray | list): (N, 2) array or list of (x, y) hits.
+        max_gap (int): largest pixel gap between hits of the same cluster.
+    Returns:
+        list[dict]: one dict per cluster, in order of each cluster's first hit:
+            location (tuple): first hit of the cluster
+            centroid (tuple): rounded mean of the hits
+            bbox (tuple): (x0, y0, x1, y1) inclusive bounds of the hits
+            hits (int): number of hits in the cluster
+    """
+    pts = np.asarray(locations, dtype=np.int32).reshape(-1, 2)
+    if pts.shape[0] == 0:
+        return []
+
+    origin = pts.min(axis=0)
+    local = pts - origin
+    w, h = local.max(axis=0) + 1
+
+    # Rasterize the hits into a small mask and let connected components do the grouping
+    mask = np.zeros((h, w), dtype=np.uint8)
+    mask[local[:, 1], local[:, 0]] = 255
+    if max_gap > 0:
+        mask = cv2.dilate(mask, np.ones((max_gap, max_gap), dtype=np.uint8))
+    _, labels = cv2.connectedComponents(mask, connectivity=8)
+    point_labels = labels[local[:, 1], local[:, 0]]
+
+    _, first_index, inverse = np.unique(point_labels, return_index=True, return_inverse=True)
+    n = first_index.size
+    counts = np.bincount(inverse, minlength=n)
+    sum_x = np.bincount(inverse, weights=pts[:, 0], minlength=n)
+    sum_y = np.bincount(inverse, weights=pts[:, 1], minlength=n)
+    mins = np.full((n, 2), np.iinfo(np.int32).max, dtype=np.int32)
+    maxs = np.full((n, 2), np.iinfo(np.int32).min, dtype=np.int32)
+    np.minimum.at(mins, inverse, pts)
+    np.maximum.at(maxs, inverse, pts)
+
+    clusters = []
+    for i in np.argsort(first_index):
+        first = pts[first_index[i]]
+        clusters.append({
+            "location": (int(first[0]), int(first[1])),
+            "centroid": (int(round(sum_x[i] / counts[i])), int(round(sum_y[i] / counts[i]))),
+            "bbox": (int(mins[i, 0]), int(mins[i, 1]), int(maxs[i, 0]), int(maxs[i, 1])),
+            "hits": int(counts[i]),
+        })
+    return clusters
+
+
+def measure_health_fill(img, location, scale=None):
+    """
+    Measures how full a health bar is from the bar row of a detection.
+    Only reads the row segment between the bar's first fill column and its end border,
+    so it adds no pass over the frame.
+    Args:
+        img (np.ndarray): BGR image the bar was detected in.
+        location (tuple): (x, y) raw detector hit, the first fill column of the bar's top row.
+        scale (float, optional): bar size relative to 1080p. Defaults to the frame's UI scale.
+    Returns:
+        float: fill ratio in [0, 1].
+    """
+    if scale is None:
+        scale = _template_scale(img)
+    x, y = location
+    width = int(round(HEALTH_BAR_WIDTH * scale))
+    row = img[y, x:x + width + 1].astype(np.int16)
+    if row.shape[0] == 0:
+        return 0.0
+
+    # The end border gives the bar's true width; bars cut off by the frame edge use the nominal width.
+    # The tolerance keeps the black (0, 0, 0) segment dividers inside the bar from matching.
+    end = np.flatnonzero(np.abs(row - HEALTH_BAR_END_COLOR).max(axis=1) <= 2)
+    length = int(end[0]) if end.size else max(width - max(1, int(round(scale))), 1)
+    if length == 0:
+        return 0.0
+    # Health drains from the right, so the last colored pixel marks the fill, dividers included
+    filled = np.flatnonzero((row[:length].max(axis=1) - row[:length].min(axis=1)) >= HEALTH_BAR_FILL_CHROMA)
+    if not filled.size:
+        return 0.0
+    return (int(filled[-1]) + 1) / length
+
+
+def find_champion_detections(img, names=None, cache=None, context=None, region=None, fill=True):
+    """
+    Finds ally, enemy, player and attached ally health bars from a single pass over the frame,
+    with the raw hits of each bar collapsed into one detection.
+    Args:
+        img (np.ndarray): BGR image to search.
+        names (iterable, optional): subset of CHAMPION_DETECTORS to run. Runs all by default.
+        cache (dict, optional): per-frame mask cache, see find_adjacent_color_groups.
+        context (DetectorContext, optional): preallocated buffers, see find_adjacent_color_groups.
+        region (tuple, optional): (x0, y0, x1, y1) slice of `img` to search, see find_adjacent_color_groups.
+        fill (bool): add each bar's `fill` ratio, see measure_health_fill.
+    Returns:
+        dict: name -> list of detections, see cluster_locations. `location` and `centroid` point at
+            the champion (detector offset applied), `bbox` covers the health bar hits
+            and `fill` is the bar's health fill ratio in [0, 1]. Captured frames report screen pixels,
+            see configure_capture; `region` is always in `img` pixels.
+    """
+    detectors = CHAMPION_DETECTORS if names is None else {name: CHAMPION_DETECTORS[name] for name in names}
+    raw = find_adjacent_color_groups(img, detectors, cache, region, _health_bar_search, context)
+
+    scale = _template_scale(img) if fill else None
+    transform = _capture_of(img)
+    results = {}
+    for name, locations in raw.items():
+        dx, dy = detectors[name]["offset"]
+        detections = cluster_locations(locations)
+        for detection in detections:
+            x0, y0, x1, y1 = detection["bbox"]
+            detection["bbox"] = (x0 - dx, y0 - dy, x1 - dx, y1 - dy)
+            if fill:
+                x, y = detection["location"]
+                detection["fill"] = measure_health_fill(img, (x - dx, y - dy), scale)
+        if transform is not None:
+            detections = [transform.detection_to_screen(detection) for detection in detections]
+        results[name] = detections
+    return results
+
+
+def find_champion_locations(img, names=None, cache=None, context=None):
+    """
+    Finds ally, enemy, player and attached ally health bars from a single pass over the frame.
+    Args:
+        img (np.ndarray): BGR image to search.
+        names (iterable, optional): subset of CHAMPION_DETECTORS to run. Runs all by default.
+        cache (dict, optional): per-frame mask cache, see find_adjacent_color_groups.
+        context (DetectorContext, optional): preallocated buffers, see find_adjacent_color_groups.
+    Returns:
+        dict: name -> list of (x,y) coordinates, one per health bar
+    """
+    detections = find_champion_detections(img, names, cache, context)
+    return {name: [d["location"] for d in dets] for name, dets in detections.items()}
+
+
+def _detect(img, name):
+    """
+    Runs a single named champion detector and returns one location per health bar.
+    """
+    return find_champion_locations(img, (name,))[name]
+
+
+def _detect_first(img, name, cache=None, context=None, changes=None):
+    """
+    Runs a SINGLE_RESULT_DETECTORS detector and returns its first location, or [] if nothing was found.
+    With `General.single_result_search` 'first_hit', the search stops at that location.
+    """
+    first = _single_result_search == "first_hit"
+    if name in UI_DETECTORS:
+        locations = find_ui_locations(img, name, cache, context, changes, first=first)
+    elif first:
+        location = find_first_adjacent_color(
+            img, CHAMPION_DETECTORS[name], search=_health_bar_search, cache=cache, context=context,
+        )
+        if location is None:
+            return []
+        transform = _capture_of(img)
+        return location if transform is None else transform.to_screen(location)
+    else:
+        locations = find_champion_locations(img, (name,), cache, context)[name]
     if not locations:
         return []
-    first_location = locations[0]
-    return (first_location[0], first_location[1])
\ No newline at end of file
+    return locations[0]
+
+
+def find_ally_locations(img):
+    """
+    Finds the location of an ally champion by using ally health bar and border colors.
+    Args:
+        img (np.ndarray): BGR image to search.
+    Returns:
+        list of (x,y) coordinates
+    """
+    return _detect(img, "ally")
+
+def find_enemy_locations(img):
+    """
+    Finds the location of an enemy champion by using enemy health bar and border colors.
+    Args:
+        img (np.ndarray): BGR image to search.
+    Returns:
+        list of (x,y) coordinates
+    """
+    return _detect(img, "enemy")
+
+
+def find_player_location(img):
+    """
+    Finds the location of the player champion by using enemy health bar and border colors.
+    Args:
+        img (np.ndarray): BGR image to search.
+    Returns:
+        list of (x,y) coordinates
+    """
+    return _detect_first(img, "player")
+
+
+def find_attached_ally_location(img):
+    """
+    Finds the location of an enemy champion by using enemy health bar and border colors.
+    Args:
+        img (np.ndarray): BGR image to search.
+    Returns:
+        list of (x,y) coordinates
+    """
+    return _detect_first(img, "attached_ally")
+
+
+def find_augment_location(img):
+    """
+    Finds the location of the augment by using hide augment button's inner and border colors.
+    Returns:
+        list of (x,y) coordinates
+    """
+    return _detect_first(img, "augment")
+
+
+def find_shop_location(img):
+    """
+    Finds the location of the shop by using hide shop button's inner and border colors.
+    Returns:
+        list of (x,y) coordinates
+    """
+    return _detect_first(img, "shop")
+
+
+def find_arena_exit_location(img):
+    """
+    Finds the location of the shop by using hide shop button's inner and border colors.
+    Returns:
+        list of (x,y) coordinates
+    """
+    return _detect_first(img, "arena_exit")
+
+
+# ===========================
+# Champion Tracking
+# ===========================
+
+
+_tracker_full_scan_interval = float(_general.get("tracker_full_scan_interval", TRACKER_FULL_SCAN_INTERVAL))
+
+
+class ChampionTracker:
+    """
+    Follows champion health bars across frames and gives each one a stable track ID.
+    Between periodic full-frame scans, each track is re-detected only inside a small window
+    around its predicted position, so the cost of an update depends on the number of tracked
+    champions rather than the frame size. A full scan runs every `full_scan_interval` seconds,
+    and immediately whenever a track cannot be found inside its window.
+    Callers that update less often than `full_scan_interval`, e.g. the game loops reading
+    FramePerception.tracks on demand after a camera snap, get a full scan on every update; for
+    them the tracker only keeps track IDs stable. Window scans pay off on the vision thread.
+    Not thread-safe: update from a single thread.
+    """
+
+    def __init__(self, names=("ally", "enemy"), full_scan_interval=None, search_margin=TRACKER_SEARCH_MARGIN,
+                 match_distance=TRACKER_MATCH_DISTANCE, max_misses=TRACKER_MAX_MISSES):
+        """
+        Initialize the ChampionTracker.
+
+        Args:
+            names (iterable): CHAMPION_DETECTORS entries to track.
+            full_scan_interval (float, optional): seconds between full-frame scans.
+                Defaults to `General.tracker_full_scan_interval`.
+            search_margin (int): pixels searched around each predicted health bar.
+            match_distance (int): largest pixel distance between a prediction and its detection.
+            max_misses (int): consecutive missed updates before a track is dropped.
+        """
+        self.names = tuple(names)
+        self.full_scan_interval = _tracker_full_scan_interval if full_scan_interval is None else full_scan_interval
+        self.search_margin = search_margin
+        self.match_distance = match_distance
+        self.max_misses = max_misses
+        self._tracks = {name: [] for name in self.names}
+        self._next_id = 1
+        self._last_full_scan = None
+        self.updates = 0
+        self.full_scans = 0
+        self.window_scans = 0
+
+
+    def update(self, frame, timestamp=None, cache=None, context=None, detect=None):
+        """
+        Updates every track from a new frame.
+        Args:
+            frame (np.ndarray): BGR frame.
+            timestamp (float, optional): capture time in `time.monotonic()` seconds. Defaults to now.
+            cache (dict, optional): per-frame mask cache, shared with full-frame scans.
+            context (DetectorContext, optional): preallocated buffers for full-frame scans. Window scans
+                change region every frame, so they allocate their (small) buffers instead.
+            detect (callable, optional): returns the full-frame detections of this frame, name -> list,
+                for every tracked name. Lets full scans reuse detections the caller already has.
+                Defaults to find_champion_detections.
+        Returns:
+            dict: name -> list of tracks seen in this frame, see `get_tracks`.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self.updates += 1
+        if frame is None:
+            return self.get_tracks()
+
+        full_scan = (
+            self._last_full_scan is None
+            or timestamp - self._last_full_scan >= self.full_scan_interval
+        )
+        if not full_scan:
+            detections = self._detect_windows(frame, timestamp)
+            matches = {name: self._associate(name, detections[name], timestamp) for name in self.names}
+            # A track that left its window is re-acquired by a full scan in the same update
+            full_scan = any(len(matches[name][0]) < len(self._tracks[name]) for name in self.names)
+        if full_scan:
+            if detect is not None:
+                detections = detect()
+            else:
+                detections = find_champion_detections(frame, self.names, cache, context)
+            matches = {name: self._associate(name, detections[name], timestamp) for name in self.names}
+            self._last_full_scan = timestamp
+            self.full_scans += 1
+
+        for name in self.names:
+            pairs, unmatched = matches[name]
+            self._apply(name, pairs, unmatched if full_scan else [], timestamp)
+        return self.get_tracks()
+
+
+    def get_tracks(self, name=None):
+        """
+        Returns copies of the tracks seen in the latest update, oldest track first.
+        Each track is a dict:
+            id (int): stable track ID, unique for the lifetime of the tracker
+            name (str): detector name
+            location, centroid, bbox, hits, fill: latest detection, see find_champion_detections
+            velocity (tuple): (vx, vy) centroid velocity in pixels per second
+            age (int): number of updates the track was seen in
+            last_seen (float): timestamp of the latest update the track was seen in
+        Args:
+            name (str, optional): detector name. Returns a dict of every tracked name by default.
+        Returns:
+            list[dict] | dict: tracks of `name`, or name -> list of tracks.
+        """
+        if name is None:
+            return {n: self.get_tracks(n) for n in self.names}
+        return [dict(track) for track in self._tracks[name] if track["misses"] == 0]
+
+
+    def get_stats(self):
+        """
+        Returns update counters, e.g. to check how often full scans are needed.
+        Returns:
+            dict: updates, full_scans, window_scans and the number of live tracks.
+        """
+        return {
+            "updates": self.updates,
+            "full_scans": self.full_scans,
+            "window_scans": self.window_scans,
+            "tracks": sum(len(tracks) for tracks in self._tracks.values()),
+        }
+
+
+    def reset(self):
+        """
+        Drops every track, e.g. after the camera moved. Track IDs keep increasing.
+        """
+        self._tracks = {name: [] for name in self.names}
+        self._last_full_scan = None
+
+
+    def _predict(self, track, timestamp):
+        """
+        Returns the (dx, dy) displacement of a track since it was last seen.
+        """
+        dt = timestamp - track["last_seen"]
+        vx, vy = track["velocity"]
+        return vx * dt, vy * dt
+
+
+    def _detect_windows(self, frame, timestamp):
+        """
+        Re-detects each track inside a window around its predicted health bar.
+        Returns:
+            dict: name -> list of detections, de-duplicated across overlapping windows.
+        """
+        H, W = frame.shape[:2]
+        transform = _capture_of(frame)
+        results = {}
+        for name in self.names:
+            run_length = CHAMPION_DETECTORS[name]["run_length"]
+            found = {}
+            for track in self._tracks[name]:
+                dx, dy = self._predict(track, timestamp)
+                bx0, by0, bx1, by1 = track["bbox"]
+                # One extra column on the left for the border color, run_length rows below the last hit
+                region = (
+                    int(bx0 + dx) - self.search_margin - 1,
+                    int(by0 + dy) - self.search_margin,
+                    int(bx1 + dx) + self.search_margin + 1,
+                    int(by1 + dy) + self.search_margin + run_length,
+                )
+                if transform is not None:
+                    # Tracks are in screen pixels, the window is searched in frame pixels
+                    region = transform.region_to_frame(region)
+                    if region is None:
+                        continue
+                region = (max(region[0], 0), max(region[1], 0), min(region[2], W), min(region[3], H))
+                if region[0] >= region[2] or region[1] >= region[3]:
+                    continue
+                self.window_scans += 1
+                for detection in find_champion_detections(frame, (name,), region=region)[name]:
+                    found.setdefault(detection["location"], detection)
+            results[name] = list(found.values())
+        return results
+
+
+    def _associate(self, name, detections, timestamp):
+        """
+        Greedily pairs tracks with the nearest detections within `match_distance`.
+        Returns:
+            tuple: (list of (track, detection) pairs, list of unmatched detections)
+        """
+        candidates = []
+        for ti, track in enumerate(self._tracks[name]):
+            dx, dy = self._predict(track, timestamp)
+            px, py = track["centroid"][0] + dx, track["centroid"][1] + dy
+            for di, detection in enumerate(detections):
+                cx, cy = detection["centroid"]
+                distance = ((cx - px) ** 2 + (cy - py) ** 2) ** 0.5
+                if distance <= self.match_distance:
+                    candidates.append((distance, ti, di))
+
+        pairs = []
+        used_tracks, used_detections = set(), set()
+        for _, ti, di in sorted(candidates):
+            if ti in used_tracks or di in used_detections:
+                continue
+            used_tracks.add(ti)
+            used_detections.add(di)
+            pairs.append((self._tracks[name][ti], detections[di]))
+        unmatched = [d for di, d in enumerate(detections) if di not in used_detections]
+        return pairs, unmatched
+
+
+    def _apply(self, name, pairs, new_detections, timestamp):
+        """
+        Moves matched tracks, ages out missed ones and starts tracks for new detections.
+        """
+        matched = set()
+        for track, detection in pairs:
+            dt = timestamp - track["last_seen"]
+            if dt > 0:
+                vx = (detection["centroid"][0] - track["centroid"][0]) / dt
+                vy = (detection["centroid"][1] - track["centroid"][1]) / dt
+                # Smooth the velocity so one noisy detection does not throw off the next window
+                old_vx, old_vy = track["velocity"]
+                track["velocity"] = ((old_vx + vx) / 2, (old_vy + vy) / 2)
+            track.update(detection)
+            track["age"] += 1
+            track["misses"] = 0
+            track["last_seen"] = timestamp
+            matched.add(track["id"])
+
+        tracks = []
+        for track in self._tracks[name]:
+            if track["id"] not in matched:
+                track["misses"] += 1
+                if track["misses"] > self.max_misses:
+                    continue
+            tracks.append(track)
+
+        for detection in new_detections:
+            track = dict(detection)
+            track.update({
+                "id": self._next_id, "name": name, "velocity": (0.0, 0.0),
+                "age": 1, "misses": 0, "last_seen": timestamp,
+            })
+            self._next_id += 1
+            tracks.append(track)
+        self._tracks[name] = tracks
+
+
+# ===========================
+# Minimap
+# ===========================
+
+
+_minimap_region = _scale_ui_region(MINIMAP_REGION)
+
+
+def _minimap_bounds(img):
+    """
+    Returns the minimap region of `img` and the size of the minimap relative to UI_REFERENCE_RESOLUTION.
+    """
+    H, W = img.shape[:2]
+    if _capture_transform.is_capture(img):
+        region = _capture_transform.region_to_frame(_minimap_region) if _minimap_region else None
+        return region, _template_scale(img)
+    ref_w, ref_h = UI_REFERENCE_RESOLUTION
+    x0, y0, x1, y1 = MINIMAP_REGION
+    region = (int(x0 * W / ref_w), int(y0 * H / ref_h), int(round(x1 * W / ref_w)), int(round(y1 * H / ref_h)))
+    return region, H / ref_h
+
+
+def find_minimap_markers(img, names=None, context=None):
+    """
+    Finds champion markers on the minimap. Only the small minimap region is searched, so this
+    costs a fraction of a camera pan and tells where to pan to.
+    Args:
+        img (np.ndarray): BGR screen capture.
+        names (iterable, optional): subset of MINIMAP_MARKERS to find. Finds all by default.
+        context (DetectorContext, optional): provides the mask buffers.
+    Returns:
+        dict: name -> list of (x,y) screen coordinates of marker centers.
+    """
+    names = tuple(MINIMAP_MARKERS) if names is None else tuple(names)
+    region, scale = _minimap_bounds(img)
+    if region is None:
+        return {name: [] for name in names}
+    x0, y0, x1, y1 = region
+    roi = img[y0:y1, x0:x1]
+    transform = _capture_of(img)
+
+    results = {}
+    for name in names:
+        marker = MINIMAP_MARKERS[name]
+        dst = None if context is None else context.buffer(("minimap", name), roi.shape[:2])
+        mask = get_color_mask(roi, marker["bgr"], marker["tolerance"], dst=dst)
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        area = stats[1:, cv2.CC_STAT_AREA]
+        keep = (area >= marker["min_area"] * scale ** 2) & (area <= marker["max_area"] * scale ** 2)
+        centers = np.rint(centroids[1:][keep]).astype(np.int32)
+        results[name] = to_location_list(_offset_locations(centers, x0, y0))
+        if transform is not None:
+            results[name] = transform.locations_to_screen(results[name])
+    return results
+
+
+def find_minimap_ally_locations(img):
+    """
+    Finds ally champion markers on the minimap.
+    Returns:
+        list of (x,y) screen coordinates
+    """
+    return find_minimap_markers(img, ("ally",))["ally"]
+
+
+def find_minimap_enemy_locations(img):
+    """
+    Finds enemy champion markers on the minimap.
+    Returns:
+        list of (x,y) screen coordinates
+    """
+    return find_minimap_markers(img, ("enemy",))["enemy"]
+
+
+# ===========================
+# Scene Classification
+# ===========================
+
+
+# Whether FramePerception only runs UI localizers the scene classifier reports as present.
+# Off by default: SCENE_STATES thresholds are not tuned on recorded frames yet, and a missed
+# state hides UI the localizers would find
+_scene_classifier = bool(_general.get("scene_classifier", False))
+
+# Frame shape -> state -> (y0, y1, x0, x1) thumbnail slice of the state's region
+_scene_cells = {}
+
+
+def _scene_regions(shape):
+    """
+    Returns the thumbnail slice of every SCENE_STATES region for a frame shape.
+    """
+    if shape not in _scene_cells:
+        H, W = shape
+        tw, th = SCENE_THUMBNAIL_SIZE
+        ref_w, ref_h = UI_REFERENCE_RESOLUTION
+        cells = {}
+        for name in SCENE_STATES:
+            region = None
+            if shape == _capture_transform.frame_shape and _ui_regions.get(name):
+                region = _capture_transform.region_to_frame(_ui_regions[name])
+            if region is not None:
+                x0, y0, x1, y1 = region
+            else:
+                rx0, ry0, rx1, ry1 = UI_DETECTORS[name]["region"]
+                x0, y0, x1, y1 = rx0 * W / ref_w, ry0 * H / ref_h, rx1 * W / ref_w, ry1 * H / ref_h
+            cells[name] = (
+                int(y0 * th / H), int(np.ceil(y1 * th / H)),
+                int(x0 * tw / W), int(np.ceil(x1 * tw / W)),
+            )
+        _scene_cells[shape] = cells
+    return _scene_cells[shape]
+
+
+def classify_scene(img):
+    """
+    Classifies the UI state of a frame from a SCENE_THUMBNAIL_SIZE thumbnail, in well under a millisecond.
+    Tells which UI elements are worth localizing; it does not locate them.
+    Args:
+        img (np.ndarray): BGR frame.
+    Returns:
+        dict: SCENE_STATES name -> bool whether the element may be shown, and "dead" -> bool
+            whether the screen is grayed out.
+    """
+    # Bilinear sampling reads 4 pixels per thumbnail pixel, area averaging would read the whole frame
+    thumb = cv2.resize(img, SCENE_THUMBNAIL_SIZE, interpolation=cv2.INTER_LINEAR).astype(np.int16)
+    chroma = thumb.max(axis=2) - thumb.min(axis=2)
+
+    scene = {"dead": bool(chroma.mean() < SCENE_DEAD_MAX_CHROMA)}
+    for name, (y0, y1, x0, x1) in _scene_regions(img.shape[:2]).items():
+        state = SCENE_STATES[name]
+        cells = thumb[y0:y1, x0:x1]
+        matches = np.zeros(cells.shape[:2], dtype=bool)
+        for color in state["colors"]:
+            matches |= (np.abs(cells - color) <= state["tolerance"]).all(axis=2)
+        scene[name] = int(matches.sum()) >= state["min_cells"]
+    return scene
+
+
+# ===========================
+# Per-frame Perception
+# ===========================
+
+
+class FramePerception:
+    """
+    Detection results for a single captured frame.
+    Each detector runs lazily on first access and its result is cached, so repeat lookups
+    within the same tick are free. Masks are shared between detectors of the same frame.
+    Get a new instance (e.g. `ScreenManager.get_perception()`) whenever a fresh frame is needed.
+    When a DetectorContext is shared between instances, the masks of an older instance are
+    overwritten by newer ones, so only the most recent instance should run new detectors.
+    """
+
+    def __init__(self, frame, context=None, tracker=None, timestamp=None, changes=None, classify=None):
+        """
+        Initialize the FramePerception.
+
+        Args:
+            frame (np.ndarray | None): BGR frame the detections are bound to.
+            context (DetectorContext, optional): preallocated detector buffers to reuse.
+            tracker (ChampionTracker, optional): tracker updated on the first `tracks` lookup.
+            timestamp (float, optional): capture time in `time.monotonic()` seconds. Defaults to now.
+            changes (RegionChangeTracker, optional): skips UI detectors whose region is unchanged.
+            classify (bool, optional): skip UI detectors the scene classifier reports as absent.
+                Defaults to `General.scene_classifier`.
+        """
+        self.frame = frame
+        self.context = context
+        self.tracker = tracker
+        self.changes = changes
+        self.timestamp = time.monotonic() if timestamp is None else timestamp
+        self._masks = {}
+        self._results = {}
+        self._detections = {}
+        self._tracks = None
+        self._scene = None
+        self._minimap = None
+        self._first = {}
+        self.classify = _scene_classifier if classify is None else classify
+
+
+    @property
+    def scene(self):
+        """UI state of the frame, see `classify_scene`."""
+        if self._scene is None:
+            self._scene = classify_scene(self.frame) if self.frame is not None else {}
+        return self._scene
+
+
+    def minimap(self, name):
+        """
+        Returns the minimap marker locations of a MINIMAP_MARKERS name, see `find_minimap_markers`.
+        """
+        if self._minimap is None:
+            self._minimap = find_minimap_markers(self.frame, context=self.context) if self.frame is not None else {}
+        return self._minimap.get(name, [])
+
+
+    def detections(self, name):
+        """
+        Returns one detection per health bar for a named detector from CHAMPION_DETECTORS.
+        Args:
+            name (str): detector name, e.g. "enemy".
+        Returns:
+            list[dict]: see find_champion_detections.
+        """
+        return self._champion_detections((name,))[name]
+
+
+    def _champion_detections(self, names):
+        """
+        Returns name -> detections, running the missing detectors in one fused pass.
+        """
+        missing = tuple(name for name in names if name not in self._detections)
+        if missing:
+            if self.frame is None:
+                self._detections.update({name: [] for name in missing})
+            else:
+                self._detections.update(find_champion_detections(self.frame, missing, self._masks, self.context))
+        return {name: self._detections[name] for name in names}
+
+
+    def tracks(self, name):
+        """
+        Returns the tracked champions of a named detector, with IDs that stay the same across frames.
+        The tracker is updated with this frame once, on the first lookup. A full scan of the
+        tracker shares its detections with `detections` and `locations` of this frame.
+        Args:
+            name (str): detector name tracked by the tracker, e.g. "enemy".
+        Returns:
+            list[dict]: see ChampionTracker.get_tracks.
+        """
+        if self.tracker is None:
+            raise ValueError("FramePerception was created without a ChampionTracker")
+        if self._tracks is None:
+            names = self.tracker.names
+            self._tracks = self.tracker.update(
+                self.frame, self.timestamp, self._masks, self.context,
+                detect=lambda: self._champion_detections(names),
+            )
+        return self._tracks.get(name, [])
+
+
+    def locations(self, name):
+        """
+        Returns the offset locations for a named detector from CHAMPION_DETECTORS or UI_DETECTORS.
+        Args:
+            name (str): detector name, e.g. "enemy" or "shop".
+        Returns:
+            list of (x,y) coordinates
+        """
+        if name not in self._results:
+            if self.frame is None:
+                self._results[name] = []
+            elif name in UI_DETECTORS:
+                if self.classify and not self.scene.get(name, True):
+                    self._results[name] = []
+                else:
+                    self._results[name] = find_ui_locations(self.frame, name, self._masks, self.context, self.changes)
+            else:
+                self._results[name] = [d["location"] for d in self.detections(name)]
+        return self._results[name]
+
+
+    def first_location(self, name):
+        """
+        Returns the first location for a named detector, or [] if nothing was found.
+        SINGLE_RESULT_DETECTORS stop at that location unless all locations were already looked up.
+        """
+        if name in SINGLE_RESULT_DETECTORS and name not in self._results:
+            if name not in self._first:
+                if self.frame is None or (name in UI_DETECTORS and self.classify and not self.scene.get(name, True)):
+                    self._first[name] = []
+                else:
+                    self._first[name] = _detect_first(self.frame, name, self._masks, self.context, self.changes)
+            return self._first[name]
+        locations = self.locations(name)
+        if not locations:
+            return []
+        return locations[0]
+
+
+    @property
+    def allies(self):
+        """Ally locations, see `find_ally_locations`."""
+        return self.locations("ally")
+
+    @property
+    def enemies(self):
+        """Enemy locations, see `find_enemy_locations`."""
+        return self.locations("enemy")
+
+    @property
+    def player(self):
+        """Player location, see `find_player_location`."""
+        return self.first_location("player")
+
+    @property
+    def attached_ally(self):
+        """Attached ally location, see `find_attached_ally_location`."""
+        return self.first_location("attached_ally")
+
+    @property
+    def augment(self):
+        """Augment location, see `find_augment_location`."""
+        return self.first_location("augment")
+
+    @property
+    def shop(self):
+        """Shop location, see `find_shop_location`."""
+        return self.first_location("shop")
+
+    @property
+    def arena_exit(self):
+        """Arena exit location, see `find_arena_exit_location`."""
+        return self.first_location("arena_exit")
+
+
+# ===========================
+# Detector Backends
+# ===========================
+
+# Allowed values of the General settings that select a detection path
+DETECTOR_SETTINGS = {
+    "health_bar_search": ("full", "pyramid"),
+    "color_classification": ("inrange", "lut"),
+    "run_detection": ("cumsum", "erode"),
+    "single_result_search": ("full", "first_hit"),
+}
+
+
+def get_detector_settings():
+    """
+    Returns the detection paths currently in use, see DETECTOR_SETTINGS, and the detection worker count.
+    """
+    return {
+        "health_bar_search": _health_bar_search,
+        "color_classification": _color_classification,
+        "run_detection": _run_detection,
+        "single_result_search": _single_result_search,
+        "detection_workers": _detection_workers,
+    }
+
+
+def configure_detectors(**settings):
+    """
+    Switches the detection paths selected by the General settings at runtime.
+    Args:
+        **settings: any of the DETECTOR_SETTINGS keys, e.g. health_bar_search="pyramid",
+            or detection_workers (int).
+    Returns:
+        dict: the previous settings, so callers can restore them.
+    """
+    global _health_bar_search, _color_classification, _run_detection, _single_result_search, _detection_workers
+    for key, value in settings.items():
+        if key == "detection_workers":
+            if not isinstance(value, int) or value < 1:
+                raise ValueError(f"Invalid detection_workers '{value}', expected a positive integer")
+            continue
+        if key not in DETECTOR_SETTINGS:
+            raise ValueError(f"Unknown detector setting: {key}")
+        if value not in DETECTOR_SETTINGS[key]:
+            raise ValueError(f"Invalid {key} '{value}', expected one of {DETECTOR_SETTINGS[key]}")
+
+    previous = get_detector_settings()
+    _health_bar_search = settings.get("health_bar_search", _health_bar_search)
+    _color_classification = settings.get("color_classification", _color_classification)
+    _run_detection = settings.get("run_detection", _run_detection)
+    _single_result_search = settings.get("single_result_search", _single_result_search)
+    _detection_workers = settings.get("detection_workers", _detection_workers)
+    return previous
+
+
+def detect_all(img, cache=None, context=None):
+    """
+    Runs every champion and UI detector on one frame.
+    Args:
+        img (np.ndarray): BGR image to search.
+        cache (dict, optional): per-frame mask cache, see find_adjacent_color_groups.
+        context (DetectorContext, optional): preallocated buffers, see find_adjacent_color_groups.
+    Returns:
+        dict: name -> list of (x,y) coordinates for every CHAMPION_DETECTORS and UI_DETECTORS entry.
+    """
+    if cache is None:
+        cache = {}
+    results = find_champion_locations(img, cache=cache, context=context)
+    for name in UI_DETECTORS:
+        results[name] = find_ui_locations(img, name, cache, context)
+    return results
+
+
+_detector_backends = {}
+
+
+def register_detector_backend(name, detect):
+    """
+    Registers a detector backend, e.g. for the equivalence checks in tools/golden_frames.py.
+    Args:
+        name (str): backend name.
+        detect (callable): takes a BGR frame and returns the same dict as `detect_all`.
+    """
+    _detector_backends[name] = detect
+
+
+def get_detector_backends():
+    """
+    Returns the registered detector backends, name -> callable(frame).
+    """
+    return dict(_detector_backends)
+
+
+def _settings_backend(**settings):
+    """
+    Returns a backend running `detect_all` with the given detector settings.
+    """
+    def detect(img):
+        previous = configure_detectors(**settings)
+        try:
+            return detect_all(img)
+        finally:
+            configure_detectors(**previous)
+    return detect
+
+
+def _context_backend(img):
+    """
+    Runs `detect_all` through FramePerception with a warmed-up DetectorContext.
+    """
+    context = DetectorContext()
+    detect_all(img, context=context)
+    perception = FramePerception(img, context, classify=False)
+    return {name: perception.locations(name) for name in list(CHAMPION_DETECTORS) + list(UI_DETECTORS)}
+
+
+def _tracked_backend(img):
+    """
+    Runs `detect_all` with ally and enemy taken from a ChampionTracker's windowed re-detection.
+    The first update does a full scan; the second one only searches around the tracks.
+    """
+    tracker = ChampionTracker(full_scan_interval=float("inf"))
+    tracker.update(img, timestamp=0.0)
+    tracks = tracker.update(img, timestamp=1 / 60)
+    results = detect_all(img)
+    for name in tracker.names:
+        results[name] = [track["location"] for track in tracks[name]]
+    return results
+
+
+def _template_backend(img):
+    """
+    Runs `detect_all` with every UI element that has a reference template found by template matching.
+    """
+    results = detect_all(img)
+    for name in UI_TEMPLATES:
+        results[name] = find_ui_locations(img, name, method="template")
+    return results
+
+
+register_detector_backend("default", detect_all)
+register_detector_backend("full", _settings_backend(health_bar_search="full", color_classification="inrange", run_detection="cumsum"))
+register_detector_backend("pyramid", _settings_backend(health_bar_search="pyramid"))
+register_detector_backend("lut", _settings_backend(color_classification="lut"))
+register_detector_backend("erode", _settings_backend(run_detection="erode"))
+register_detector_backend("fast", _settings_backend(health_bar_search="pyramid", color_classification="lut", run_detection="erode"))
+register_detector_backend("parallel", _settings_backend(detection_workers=4))
+register_detector_backend("context", _context_backend)
+register_detector_backend("tracked", _tracked_backend)
+register_detector_backend("template", _template_backend)
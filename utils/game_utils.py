@@ -6,7 +6,6 @@ import random
 import math
 from core.constants import DATA_DRAGON_DEFAULT_LOCALE, DATA_DRAGON_VERSIONS_URL, SCREEN_HEIGHT, SCREEN_WIDTH, GAME_DISTANCE_PARAMS
 from utils.config_utils import load_settings
-from utils.cv_utils import find_shop_location, find_player_location
 from utils.general_utils import click_percent, send_keybind, move_mouse_percent
 _keybinds, _general = load_settings()
 
@@ -282,13 +281,13 @@ def buy_recommended_items(screen_manager):
     NOTE:
         Augment popups will automatically close the shop and also nullify interaction with it.
     """
-    shop_location = find_shop_location(screen_manager.get_latest_frame())
+    shop_location = screen_manager.get_perception(fresh=True).shop
     
     # Open shop if not already open
     if not shop_location:
         send_keybind("evtOpenShop", _keybinds)
         time.sleep(0.5)
-        shop_location = find_shop_location(screen_manager.get_latest_frame())
+        shop_location = screen_manager.get_perception(fresh=True).shop
         if not shop_location:
             send_keybind("evtOpenShop", _keybinds)
             time.sleep(0.5)
@@ -305,7 +304,7 @@ def buy_recommended_items(screen_manager):
     # Ensure shop is closed
     send_keybind("evtOpenShop", _keybinds)
     time.sleep(0.5)
-    if find_shop_location(screen_manager.get_latest_frame()):
+    if screen_manager.get_perception(fresh=True).shop:
         return False
     return True
 
@@ -317,13 +316,13 @@ def buy_items_list(screen_manager, item_list):
         item_names (list of str): List of item names to buy.
     NOTE: Shop CANNOT be obstructed (by augment popups or other UI elements) or else chat will be opened instead.
     """
-    shop_location = find_shop_location(screen_manager.get_latest_frame())
+    shop_location = screen_manager.get_perception(fresh=True).shop
         
     # Open shop if not already open
     if not shop_location:
         send_keybind("evtOpenShop", _keybinds)
         time.sleep(0.5)
-        shop_location = find_shop_location(screen_manager.get_latest_frame())
+        shop_location = screen_manager.get_perception(fresh=True).shop
         if not shop_location:
             time.sleep(0.5)
             send_keybind("evtOpenShop", _keybinds)
@@ -341,7 +340,7 @@ def buy_items_list(screen_manager, item_list):
     # Ensure shop is closed
     send_keybind("evtOpenShop", _keybinds)
     time.sleep(0.5)
-    if find_shop_location(screen_manager.get_latest_frame()):
+    if screen_manager.get_perception(fresh=True).shop:
         return False
     return True
 
@@ -365,6 +364,32 @@ def pan_to_ally(ally_number=1, press_time=0.01):
         logging.error(f"Invalid ally number: {ally_number}. Must be 1, 2, 3, or 4.")
     
 
+def pan_to_minimap(minimap_location):
+    """
+    Pans the camera to a minimap location by clicking it.
+    Args:
+        minimap_location (tuple): (x, y) screen coordinates on the minimap, e.g. from `find_minimap_markers`.
+    """
+    click_percent(minimap_location[0], minimap_location[1])
+
+
+def pick_minimap_ally(ally_locations, enemy_locations=()):
+    """
+    Picks the ally marker to pan to: the one closest to an enemy marker, i.e. where the fight is.
+    Args:
+        ally_locations (list): (x, y) ally minimap markers.
+        enemy_locations (list): (x, y) enemy minimap markers.
+    Returns:
+        tuple: (x, y) of the picked ally marker.
+    """
+    if not enemy_locations:
+        return ally_locations[0]
+    return min(
+        ally_locations,
+        key=lambda ally: min(get_pixel_distance(ally, enemy) for enemy in enemy_locations),
+    )
+
+
 def retreat(current_coords, threat_coords):
     """
     Moves the player away from the threat location by a distance proportional to the
@@ -0,0 +1,214 @@
+import numpy as np
+import cv2
+from core.constants import (
+    CHAMPION_DETECTORS,
+    HEALTH_BAR_END_COLOR,
+    HEALTH_BAR_WIDTH,
+    MINIMAP_MARKERS,
+    MINIMAP_REGION,
+    UI_DETECTORS,
+    UI_REFERENCE_RESOLUTION,
+    UI_TEMPLATES,
+)
+from utils.cv_utils import get_ui_template
+
+
+# ===========================
+# Synthetic Frames
+# ===========================
+
+# Common resolutions for synthetic scenes, name -> (width, height)
+SYNTHETIC_RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+# Health bar geometry at 1080p, see assets/health_references.png
+_BAR_WIDTH = HEALTH_BAR_WIDTH
+_BAR_BRIGHT_ROWS = 4
+_BAR_DARK_ROWS = 6
+_BAR_FRAME_COLOR = (0, 4, 0)
+_BAR_END_COLOR = HEALTH_BAR_END_COLOR
+_BAR_EMPTY_COLOR = (33, 30, 30)
+
+
+def _shade(color, factor, shift=0):
+    """
+    Returns `color` scaled by `factor` and shifted by `shift`, clipped to a valid BGR color.
+    """
+    return tuple(int(c) for c in np.clip(np.array(color, dtype=np.float32) * factor + shift, 0, 255))
+
+
+def draw_health_bar(img, x, y, name="enemy", fill=1.0, scale=1.0):
+    """
+    Paints a champion health bar the way the game renders it.
+    Only the first column of the bar uses the exact detector color, like in the reference frames.
+    Args:
+        img (np.ndarray): BGR image to paint on, modified in place.
+        x (int): left edge of the bar's border column.
+        y (int): top edge of the bar's colored rows.
+        name (str): CHAMPION_DETECTORS name, selects the border and fill colors.
+        fill (float): health fraction in [0, 1].
+        scale (float): size relative to 1080p.
+    Returns:
+        dict: name, location (what the detector reports, offset applied), bbox (x0, y0, x1, y1)
+            of the painted bar and fill.
+    """
+    det = CHAMPION_DETECTORS[name]
+    border = max(1, int(round(scale)))
+    width = int(round(_BAR_WIDTH * scale))
+    bright = max(det["run_length"], int(round(_BAR_BRIGHT_ROWS * scale)))
+    dark = int(round(_BAR_DARK_ROWS * scale))
+    fill_width = int(round((width - border) * min(max(fill, 0.0), 1.0)))
+
+    x_fill = x + border
+    y_dark = y + bright
+    y_end = y_dark + dark
+    img[y - border:y, x:x + width + border] = _BAR_FRAME_COLOR
+    img[y:y_end, x:x_fill] = det["bgr_1"]
+    img[y:y_end, x_fill:x + width] = _BAR_EMPTY_COLOR
+    img[y:y_dark, x_fill:x_fill + fill_width] = _shade(det["bgr_2"], 1.0, 3)
+    img[y_dark:y_end, x_fill:x_fill + fill_width] = _shade(det["bgr_2"], 0.8)
+    img[y:y_end, x + width:x + width + border] = _BAR_END_COLOR
+    if fill_width > 0:
+        # The first column keeps the exact detector color on the bright rows
+        img[y:y_dark, x_fill:x_fill + border] = det["bgr_2"]
+
+    dx, dy = det["offset"]
+    return {
+        "name": name,
+        "location": (x_fill + dx, y + dy),
+        "bbox": (x, y - border, x + width + border - 1, y_end - 1),
+        "fill": fill,
+    }
+
+
+def draw_ui_element(img, name, scale=1.0, position=(0.5, 0.5)):
+    """
+    Paints a UI element inside its region of interest. Elements with a reference template
+    (UI_TEMPLATES) are pasted as the scaled template, the others as their detector's color pair.
+    Args:
+        img (np.ndarray): BGR image to paint on, modified in place.
+        name (str): UI_DETECTORS name, e.g. "shop".
+        scale (float): size relative to 1080p.
+        position (tuple): (x, y) position inside the region as fractions of its size.
+    Returns:
+        dict: name, location (what the detector reports, offset applied) and bbox (x0, y0, x1, y1)
+            of the painted element.
+    """
+    det = UI_DETECTORS[name]
+    H, W = img.shape[:2]
+    ref_w, ref_h = UI_REFERENCE_RESOLUTION
+    x0, y0, x1, y1 = det["region"]
+    x = int((x0 + (x1 - x0) * position[0]) * W / ref_w)
+    y = int((y0 + (y1 - y0) * position[1]) * H / ref_h)
+    dx, dy = det["offset"]
+    matcher = get_ui_template(name, round(scale, 4)) if name in UI_TEMPLATES else None
+    if matcher is not None:
+        # Place the template so its color-pair anchor lands on (x, y)
+        th, tw = matcher.template.shape[:2]
+        ax, ay = matcher.anchor
+        tx, ty = min(max(x - ax, 0), W - tw), min(max(y - ay, 0), H - th)
+        img[ty:ty + th, tx:tx + tw] = matcher.template
+        # Resampling blurs the one-pixel color pair, the game renders it crisp at every resolution
+        x, y = tx + ax, ty + ay
+        img[y - 1, x] = det["bgr_1"]
+        img[y, x] = det["bgr_2"]
+        return {"name": name, "location": (x + dx, y + dy), "bbox": (tx, ty, tx + tw - 1, ty + th - 1)}
+
+    width = int(round(60 * scale))
+    rows = max(1, int(round(scale)))
+    img[y - rows:y, x:x + width] = det["bgr_1"]
+    img[y:y + rows, x:x + width] = det["bgr_2"]
+    return {"name": name, "location": (x + dx, y + dy), "bbox": (x, y - rows, x + width - 1, y + rows - 1)}
+
+
+def draw_minimap(img, markers, rng, scale=1.0):
+    """
+    Paints the minimap with champion markers at random, non-overlapping positions.
+    Args:
+        img (np.ndarray): BGR image to paint on, modified in place.
+        markers (dict): MINIMAP_MARKERS name -> number of markers.
+        rng (np.random.Generator): random generator.
+        scale (float): size relative to 1080p.
+    Returns:
+        list[dict]: name and location (marker center) of every marker.
+    """
+    H, W = img.shape[:2]
+    ref_w, ref_h = UI_REFERENCE_RESOLUTION
+    x0, y0, x1, y1 = MINIMAP_REGION
+    x0, y0, x1, y1 = int(x0 * W / ref_w), int(y0 * H / ref_h), int(round(x1 * W / ref_w)), int(round(y1 * H / ref_h))
+    img[y0:y1, x0:x1] = (38, 52, 34)
+
+    radius = max(4, int(round(12 * scale)))
+    ring = max(1, int(round(2 * scale)))
+    truth = []
+    centers = []
+    for name, count in markers.items():
+        for _ in range(count):
+            for _ in range(50):
+                cx = int(rng.integers(x0 + radius + ring, x1 - radius - ring))
+                cy = int(rng.integers(y0 + radius + ring, y1 - radius - ring))
+                if all((cx - px) ** 2 + (cy - py) ** 2 > (2 * (radius + ring) + 2) ** 2 for px, py in centers):
+                    break
+            else:
+                continue
+            centers.append((cx, cy))
+            cv2.circle(img, (cx, cy), radius - 1, _shade((120, 110, 100), float(rng.uniform(0.6, 1.2))), -1)
+            cv2.circle(img, (cx, cy), radius, MINIMAP_MARKERS[name]["bgr"], ring)
+            truth.append({"name": name, "location": (cx, cy)})
+    return truth
+
+
+def generate_scene(width=1920, height=1080, bars=8, names=("ally", "enemy", "player"), ui=(), seed=0, minimap=None):
+    """
+    Generates a synthetic frame with health bars painted over a smooth noisy background.
+    Bars never overlap and their champion locations may fall outside the frame.
+    Args:
+        width (int): frame width in pixels.
+        height (int): frame height in pixels.
+        bars (int): number of health bars to paint.
+        names (iterable): CHAMPION_DETECTORS names to cycle through.
+        ui (iterable): UI_DETECTORS names to paint.
+        seed (int): random seed.
+        minimap (dict, optional): MINIMAP_MARKERS name -> number of markers, see draw_minimap.
+    Returns:
+        tuple: (BGR frame, list of dicts from draw_health_bar, draw_ui_element and draw_minimap)
+    """
+    rng = np.random.default_rng(seed)
+    scale = height / 1080
+
+    # Low-frequency color blobs plus pixel noise, so exact detector colors are unlikely by chance
+    blobs = rng.integers(0, 256, (max(height // 40, 2), max(width // 40, 2), 3), dtype=np.uint8)
+    img = cv2.resize(blobs, (width, height), interpolation=cv2.INTER_LINEAR)
+    noise = rng.integers(-6, 7, img.shape, dtype=np.int16)
+    img = np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+    # UI elements first, so health bars can be placed around them. Spread horizontally, their regions overlap
+    ui = tuple(ui)
+    truth = [draw_ui_element(img, name, scale, ((i + 1) / (len(ui) + 1), 0.5)) for i, name in enumerate(ui)]
+    ui_boxes = [item["bbox"] for item in truth]
+    if minimap:
+        truth += draw_minimap(img, minimap, rng, scale)
+        ref_w, ref_h = UI_REFERENCE_RESOLUTION
+        x0, y0, x1, y1 = MINIMAP_REGION
+        ui_boxes.append((int(x0 * width / ref_w), int(y0 * height / ref_h), width, height))
+
+    names = tuple(names)
+    bar_w = int(round((_BAR_WIDTH + 2) * scale)) + 2
+    bar_h = int(round((_BAR_BRIGHT_ROWS + _BAR_DARK_ROWS + 2) * scale)) + 2
+    placed = []
+    attempts = 0
+    while len(placed) < bars and attempts < bars * 50:
+        attempts += 1
+        x = int(rng.integers(2, width - bar_w - 2))
+        y = int(rng.integers(2, height - bar_h - 2))
+        if any(abs(x - px) < bar_w + 4 and abs(y - py) < bar_h + 4 for px, py in placed):
+            continue
+        if any(x - 2 <= bx1 and bx0 <= x + bar_w and y - 2 <= by1 and by0 <= y + bar_h for bx0, by0, bx1, by1 in ui_boxes):
+            continue
+        name = names[len(placed) % len(names)]
+        placed.append((x, y))
+        truth.append(draw_health_bar(img, x, y, name, float(rng.uniform(0.05, 1.0)), scale))
+    return img, truth